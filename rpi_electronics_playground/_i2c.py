@@ -0,0 +1,57 @@
+"""Shared I2C bus handles for components on the same bus."""
+
+import threading
+from pathlib import Path
+
+import smbus2 as smbus
+
+# Device tree property holding the bus clock as a big-endian 32-bit integer
+_CLOCK_FREQUENCY_PATH = "/sys/class/i2c-adapter/i2c-{bus_number}/of_node/clock-frequency"
+
+# Open bus handles and the number of components using each, keyed by bus number
+_BUSES: dict[int, tuple[smbus.SMBus, int]] = {}
+_LOCK = threading.Lock()
+
+
+def get_bus(bus_number: int) -> smbus.SMBus:
+    """Get a handle for an I2C bus, opening it if no other component is using it.
+
+    :param int bus_number: I2C bus number.
+    :return smbus.SMBus: The shared bus handle.
+    """
+    with _LOCK:
+        if bus_number in _BUSES:
+            bus, users = _BUSES[bus_number]
+        else:
+            bus, users = smbus.SMBus(bus_number), 0
+        _BUSES[bus_number] = (bus, users + 1)
+        return bus
+
+
+def release_bus(bus_number: int) -> None:
+    """Release a handle obtained from get_bus, closing the bus once no component is using it.
+
+    :param int bus_number: I2C bus number.
+    """
+    with _LOCK:
+        if bus_number not in _BUSES:
+            return
+
+        bus, users = _BUSES.pop(bus_number)
+        if users > 1:
+            _BUSES[bus_number] = (bus, users - 1)
+        else:
+            bus.close()
+
+
+def get_bus_clock_hz(bus_number: int) -> int | None:
+    """Get the configured clock frequency of an I2C bus from the device tree.
+
+    :param int bus_number: I2C bus number.
+    :return int | None: Bus clock in Hz, or None if it cannot be determined.
+    """
+    try:
+        data = Path(_CLOCK_FREQUENCY_PATH.format(bus_number=bus_number)).read_bytes()
+    except OSError:
+        return None
+    return int.from_bytes(data[:4], "big") if len(data) >= 4 else None  # noqa: PLR2004
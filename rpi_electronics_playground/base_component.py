@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import ctypes
 import logging
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from types import TracebackType
 from typing import TypeVar
 
@@ -11,10 +15,96 @@ from RPi import GPIO
 
 T = TypeVar("T", bound="BaseElectronicsComponent")
 
+# GPIO pins configured by any component, mapped to the (mode, initial, pull_up_down) they were set up with
+_CONFIGURED_PINS: dict[int, tuple[int, int | None, int | None]] = {}
+
+# Loggers already configured for each component name
+_LOGGER_CACHE: dict[str, logging.Logger] = {}
+
+# SCHED_FIFO priority for timing-critical sections, kept below the kernel's own priority 99 threads
+_REALTIME_PRIORITY = 80
+
+# mlockall() flags from <sys/mman.h>
+_MCL_CURRENT = 1
+_MCL_FUTURE = 2
+
+# Whether mlockall() has been attempted, it only needs to happen once per process
+_memory_locked = False
+
+
+def _lock_memory() -> None:
+    """Lock current and future process memory into RAM so page faults cannot stall timing loops."""
+    global _memory_locked  # noqa: PLW0603
+    if _memory_locked:
+        return
+
+    _memory_locked = True
+    libc = ctypes.CDLL("libc.so.6", use_errno=True)
+    if libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) != 0:
+        errno = ctypes.get_errno()
+        logging.getLogger("rpi_electronics_playground").warning("mlockall failed: %s", os.strerror(errno))
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that formats the timestamp at most once per wall-clock second."""
+
+    def __init__(self, fmt: str, datefmt: str) -> None:
+        """Initialize the formatter.
+
+        :param str fmt: Format string for log records.
+        :param str datefmt: Format string for timestamps, with at most second resolution.
+        """
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self._last_second = -1
+        self._last_time = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:  # noqa: N802
+        """Format the record's creation time, reusing the previous result within the same second.
+
+        :param logging.LogRecord record: The log record.
+        :param str | None datefmt: Format string for the timestamp.
+        :return str: The formatted timestamp.
+        """
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_time = super().formatTime(record, datefmt)
+            self._last_second = second
+        return self._last_time
+
+
+def _build_logger(component_name: str) -> logging.Logger:
+    """Create and configure the logger for a component.
+
+    :param str component_name: Name of the component.
+    :return logging.Logger: Configured logger instance.
+    """
+    # Create logger for this component
+    logger = logging.getLogger(f"rpi_electronics_playground.{component_name.lower()}")
+
+    # Only add handler if it doesn't already have one (avoid duplicates)
+    if not logger.handlers:
+        # Create formatter
+        formatter = _CachedTimeFormatter(
+            fmt="%(asctime)s [%(name)s] %(levelname)s: %(message)s", datefmt="[%d-%m-%Y|%H:%M:%S]"
+        )
+
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+        logger.setLevel(logging.INFO)
+
+    return logger
+
 
 class BaseElectronicsComponent(ABC):
     """Base class for all electronic components providing standard patterns."""
 
+    __slots__ = ("_gpio_pins", "component_name", "is_initialized", "logger")
+
+    # Whether timing-critical sections run under real-time scheduling, set by components that support it
+    realtime = False
+
     def __init__(self, component_name: str) -> None:
         """Initialize the base component.
 
@@ -23,6 +113,7 @@ class BaseElectronicsComponent(ABC):
         self.component_name = component_name
         self.logger = self._setup_logger()
         self.is_initialized = False
+        self._gpio_pins: list[int] = []
 
         try:
             self._initialize_component()
@@ -38,22 +129,8 @@ class BaseElectronicsComponent(ABC):
 
         :return logging.Logger: Configured logger instance.
         """
-        # Create logger for this component
-        logger = logging.getLogger(f"rpi_electronics_playground.{self.component_name.lower()}")
-
-        # Only add handler if it doesn't already have one (avoid duplicates)
-        if not logger.handlers:
-            # Create formatter
-            formatter = logging.Formatter(
-                fmt="%(asctime)s [%(name)s] %(levelname)s: %(message)s", datefmt="[%d-%m-%Y|%H:%M:%S]"
-            )
-
-            # Create console handler
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
-            logger.setLevel(logging.INFO)
-
+        if (logger := _LOGGER_CACHE.get(self.component_name)) is None:
+            logger = _LOGGER_CACHE[self.component_name] = _build_logger(self.component_name)
         return logger
 
     @abstractmethod
@@ -65,28 +142,90 @@ class BaseElectronicsComponent(ABC):
         pin: int,
         mode: int,
         initial: int | None = None,
+        pull_up_down: int | None = None,
     ) -> None:
         """Set up a GPIO pin with proper error handling.
 
         :param int pin: The GPIO pin number.
         :param int mode: The pin mode (GPIO.IN or GPIO.OUT).
         :param int initial: Initial state for output pins (optional).
+        :param int pull_up_down: Pull resistor for input pins, e.g. GPIO.PUD_UP (optional).
         """
+        self._claim_gpio_pin(pin)
+
+        # An initial level is always driven again, as the pin may have been changed since it was set up
+        state = (mode, initial, pull_up_down)
+        if initial is None and _CONFIGURED_PINS.get(pin) == state:
+            self.logger.debug("GPIO pin %d already configured, skipping setup", pin)
+            return
+
+        kwargs = {}
+        if mode == GPIO.OUT and initial is not None:
+            # Drive the initial level as part of setup so the pin never glitches through LOW
+            kwargs["initial"] = initial
+        if pull_up_down is not None:
+            kwargs["pull_up_down"] = pull_up_down
+
         try:
-            GPIO.setup(pin, mode)
-            if mode == GPIO.OUT and initial is not None:
-                GPIO.output(pin, initial)
+            GPIO.setup(pin, mode, **kwargs)
+            _CONFIGURED_PINS[pin] = state
             self.logger.debug("GPIO pin %d configured as %s", pin, "OUTPUT" if mode == GPIO.OUT else "INPUT")
         except Exception:
             self.logger.exception("Failed to setup GPIO pin %d", pin)
             raise
 
+    def _claim_gpio_pin(self, pin: int) -> None:
+        """Record a GPIO pin as owned by this component, so cleanup releases it.
+
+        :param int pin: The GPIO pin number, including pins set up by a third-party library.
+        """
+        if pin not in self._gpio_pins:
+            self._gpio_pins.append(pin)
+
     def _ensure_gpio_mode_set(self) -> None:
-        """Ensure GPIO mode is set to BCM if not already set."""
+        """Ensure GPIO mode is set to BCM if not already set.
+
+        The mode is queried every time rather than cached, since a GPIO cleanup outside this package resets it.
+        """
+        GPIO.setwarnings(False)
         if GPIO.getmode() is None:
+            # With no mode set, GPIO was cleaned up elsewhere, so no recorded pin configuration still holds
+            _CONFIGURED_PINS.clear()
             GPIO.setmode(GPIO.BCM)
             self.logger.debug("GPIO mode set to BCM")
 
+    @contextmanager
+    def _realtime_section(self) -> Iterator[None]:
+        """Run the enclosed block under SCHED_FIFO with memory locked, if real-time mode is enabled.
+
+        The previous scheduling policy is restored on exit. This needs root or CAP_SYS_NICE, and falls back to
+        normal scheduling with a warning otherwise. Priority 80 leaves room above for kernel threads; a higher
+        priority is not always better. For the tightest timing, also isolate a core with the `isolcpus=` and
+        `nohz_full=` kernel parameters.
+        """
+        if not self.realtime:
+            yield
+            return
+
+        try:
+            previous_policy = os.sched_getscheduler(0)
+            previous_param = os.sched_getparam(0)
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(_REALTIME_PRIORITY))
+        except OSError:
+            self.logger.warning("Real-time scheduling unavailable (requires root or CAP_SYS_NICE)")
+            yield
+            return
+
+        try:
+            _lock_memory()
+        except OSError:
+            self.logger.warning("Memory locking unavailable")
+
+        try:
+            yield
+        finally:
+            os.sched_setscheduler(0, previous_policy, previous_param)
+
     def cleanup(self) -> None:
         """Clean up component resources."""
         if not self.is_initialized:
@@ -97,8 +236,12 @@ class BaseElectronicsComponent(ABC):
             # Allow subclass-specific cleanup
             self._cleanup_component()
 
-            # Clean up all GPIO pins
-            GPIO.cleanup()
+            # Release only this component's pins, in one call, leaving other live components' pins and the mode
+            if self._gpio_pins:
+                GPIO.cleanup(self._gpio_pins)
+                for pin in self._gpio_pins:
+                    _CONFIGURED_PINS.pop(pin, None)
+                self._gpio_pins = []
 
             self.is_initialized = False
             self.logger.info("%s cleanup complete", self.component_name)
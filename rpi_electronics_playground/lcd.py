@@ -4,107 +4,162 @@ import time
 
 import smbus2 as smbus
 
+from rpi_electronics_playground._i2c import get_bus, get_bus_clock_hz, release_bus
 from rpi_electronics_playground.base_component import BaseElectronicsComponent
 
 
+def _build_nibble_table(mode: int, backlight: int) -> tuple[bytes, ...]:
+    """Build the bytes that clock each possible byte value into the LCD in 4-bit mode.
+
+    Each entry holds the high nibble then the low nibble, each written with EN = 1 then EN = 0.
+
+    :param int mode: The RS bit (0x00 for commands, 0x01 for data).
+    :param int backlight: The backlight bit (0x08 for on, 0x00 for off).
+    :return tuple[bytes, ...]: Four-byte sequences indexed by byte value.
+    """
+    table = []
+    for value in range(256):
+        high = (value & 0xF0) | mode | backlight
+        low = ((value & 0x0F) << 4) | mode | backlight
+        table.append(bytes((high | 0x04, high, low | 0x04, low)))
+    return tuple(table)
+
+
 class LCD1602(BaseElectronicsComponent):
     """Class for controlling an LCD1602 display via I2C interface."""
 
-    def __init__(self, address: int = 0x27, backlight: bool = True, bus_number: int = 1) -> None:
+    COLUMNS = 16
+    ROWS = 2
+    _BLANK = 0x20
+    _UNKNOWN = -1
+
+    # Execution time of clear display and return home (HD44780 datasheet); other commands take ~37 us,
+    # which is shorter than the I2C transfer that follows them
+    CLEAR_HOME_DELAY = 0.00152
+
+    # HD44780 reset by instruction: the 0x3 function set nibble three times, then 0x2 to enter 4-bit mode, each with
+    # the wait the datasheet requires after it (>4.1 ms, >100 us, then >37 us)
+    _INIT_NIBBLES = ((0x3, 0.0045), (0x3, 0.00015), (0x3, 0.00005), (0x2, 0.00005))
+
+    # Nibble sequences for every byte value, indexed by backlight state then byte value
+    _COMMAND_NIBBLES = (_build_nibble_table(0x00, 0x00), _build_nibble_table(0x00, 0x08))
+    _DATA_NIBBLES = (_build_nibble_table(0x01, 0x00), _build_nibble_table(0x01, 0x08))
+
+    def __init__(
+        self,
+        address: int = 0x27,
+        backlight: bool = True,
+        bus_number: int = 1,
+        i2c_clock_hz: int = 400_000,
+    ) -> None:
         """Initialize the LCD1602 display.
 
         :param int address: I2C address of the LCD display.
         :param bool backlight: Whether to enable the backlight.
         :param int bus_number: I2C bus number.
+        :param int i2c_clock_hz: Bus clock the display is expected to run at; a warning is logged if lower.
         """
         self.address = address
         self.backlight_enabled = backlight
         self.bus_number = bus_number
+        self.i2c_clock_hz = i2c_clock_hz
         self.bus: smbus.SMBus | None = None
+        self._tx_buf = bytearray()
+
+        # Character codes currently shown on each row, or _UNKNOWN after a failed write
+        self._shadow: list[list[int]] = [[self._BLANK] * self.COLUMNS for _ in range(self.ROWS)]
 
         super().__init__("LCD1602")
 
     def _initialize_component(self) -> None:
         """Initialize the LCD1602 display hardware."""
-        self.bus = smbus.SMBus(self.bus_number)
+        self.bus = get_bus(self.bus_number)
+        self._check_bus_clock()
         self._initialize_display()
 
-    def _write_word(self, data: int) -> None:
-        """Write a byte to the LCD display.
-
-        :param int data: The byte to write.
-        """
-        temp = data
-        if self.backlight_enabled:
-            temp |= 0x08
-        else:
-            temp &= 0xF7
-        self.bus.write_byte(self.address, temp)  # type: ignore[union-attr]
+    def _check_bus_clock(self) -> None:
+        """Warn if the I2C bus runs slower than the requested clock."""
+        clock_hz = get_bus_clock_hz(self.bus_number)
+        if clock_hz is None:
+            self.logger.debug("Could not determine clock frequency of I2C bus %d", self.bus_number)
+        elif clock_hz < self.i2c_clock_hz:
+            self.logger.warning(
+                "I2C bus %d runs at %d Hz; add 'dtparam=i2c_arm_baudrate=%d' to /boot/config.txt for faster updates",
+                self.bus_number,
+                clock_hz,
+                self.i2c_clock_hz,
+            )
+
+    def _flush(self) -> None:
+        """Send all queued bytes to the LCD display in a single I2C transaction."""
+        if self._tx_buf:
+            payload = bytes(self._tx_buf)
+            self._tx_buf.clear()
+            self.bus.i2c_rdwr(smbus.i2c_msg.write(self.address, payload))  # type: ignore[union-attr]
 
     def _send_command(self, command: int) -> None:
         """Send a command to the LCD display.
 
         :param int command: The command byte to send.
         """
-        # Send bit7-4 firstly
-        buf = command & 0xF0
-        buf |= 0x04  # RS = 0, RW = 0, EN = 1
-        self._write_word(buf)
-        time.sleep(0.002)
-        buf &= 0xFB  # Make EN = 0
-        self._write_word(buf)
-
-        # Send bit3-0 secondly
-        buf = (command & 0x0F) << 4
-        buf |= 0x04  # RS = 0, RW = 0, EN = 1
-        self._write_word(buf)
-        time.sleep(0.002)
-        buf &= 0xFB  # Make EN = 0
-        self._write_word(buf)
-
-    def _send_data(self, data: int) -> None:
-        """Send data to the LCD display.
-
-        :param int data: The data byte to send.
+        self._tx_buf += self._COMMAND_NIBBLES[self.backlight_enabled][command]
+        self._flush()
+
+        # Only clear and return home need more settle time than the I2C transfer provides
+        if command in (0x01, 0x02, 0x03):
+            time.sleep(self.CLEAR_HOME_DELAY)
+
+    def _send_init_nibble(self, nibble: int) -> None:
+        """Send a single function set nibble while the display may still be in 8-bit mode.
+
+        :param int nibble: The high nibble of the function set command.
         """
-        # Send bit7-4 firstly
-        buf = data & 0xF0
-        buf |= 0x05  # RS = 1, RW = 0, EN = 1
-        self._write_word(buf)
-        time.sleep(0.002)
-        buf &= 0xFB  # Make EN = 0
-        self._write_word(buf)
-
-        # Send bit3-0 secondly
-        buf = (data & 0x0F) << 4
-        buf |= 0x05  # RS = 1, RW = 0, EN = 1
-        self._write_word(buf)
-        time.sleep(0.002)
-        buf &= 0xFB  # Make EN = 0
-        self._write_word(buf)
+        value = (nibble << 4) | (0x08 if self.backlight_enabled else 0x00)
+        self._tx_buf += bytes((value | 0x04, value))
+        self._flush()
 
     def _initialize_display(self) -> None:
         """Initialize the LCD display with proper settings."""
         try:
-            self._send_command(0x33)  # Must initialize to 8-line mode at first
-            time.sleep(0.005)
-            self._send_command(0x32)  # Then initialize to 4-line mode
-            time.sleep(0.005)
+            # Send the reset nibbles one transaction at a time so each gets its wait, then batch once in 4-bit mode
+            for nibble, delay in self._INIT_NIBBLES:
+                self._send_init_nibble(nibble)
+                time.sleep(delay)
             self._send_command(0x28)  # 2 Lines & 5*7 dots
-            time.sleep(0.005)
             self._send_command(0x0C)  # Enable display without cursor
-            time.sleep(0.005)
             self._send_command(0x01)  # Clear Screen
-            self.bus.write_byte(self.address, 0x08)  # type: ignore[union-attr]
+            self.bus.write_byte(self.address, 0x08 if self.backlight_enabled else 0x00)  # type: ignore[union-attr]
             self.logger.info("LCD1602 display initialized successfully at address 0x%02X", self.address)
         except Exception:
             self.logger.exception("Failed to initialize LCD1602 display!")
             raise
 
+    @staticmethod
+    def _changed_runs(old: list[int], new: bytes) -> list[tuple[int, int]]:
+        """Find the runs of positions where the new characters differ from the old ones.
+
+        Runs separated by a single unchanged character are merged, since resending that
+        character costs the same as moving the cursor.
+
+        :param list[int] old: Character codes currently shown.
+        :param bytes new: Character codes to show.
+        :return list[tuple[int, int]]: (start, end) offsets of each changed run, end exclusive.
+        """
+        runs: list[tuple[int, int]] = []
+        for i, (current, wanted) in enumerate(zip(old, new, strict=False)):
+            if current != wanted:
+                if runs and i - runs[-1][1] <= 1:
+                    runs[-1] = (runs[-1][0], i + 1)
+                else:
+                    runs.append((i, i + 1))
+        return runs
+
     def clear(self) -> None:
         """Clear the LCD display."""
         try:
             self._send_command(0x01)
+            for row in self._shadow:
+                row[:] = [self._BLANK] * self.COLUMNS
         except Exception:
             self.logger.exception("Error clearing LCD display!")
 
@@ -116,18 +171,25 @@ class LCD1602(BaseElectronicsComponent):
         :param str text: Text to display.
         """
         # Constrain coordinates to valid ranges
-        x = max(0, min(15, x))
-        y = max(0, min(1, y))
+        x = max(0, min(self.COLUMNS - 1, x))
+        y = max(0, min(self.ROWS - 1, y))
 
-        # Move cursor to position
-        address = 0x80 + 0x40 * y + x
-        self._send_command(address)
+        # Characters past the end of the row are not visible
+        data = text.encode("latin-1", "replace")[: self.COLUMNS - x]
+        shown = self._shadow[y][x : x + len(data)]
 
-        # Write each character
+        # Only send the characters that differ from what is already shown. Each changed run is a
+        # cursor move followed by a burst relying on DDRAM auto-increment, all in one transaction.
         try:
-            for char in text:
-                self._send_data(ord(char))
+            command_table = self._COMMAND_NIBBLES[self.backlight_enabled]
+            data_table = self._DATA_NIBBLES[self.backlight_enabled]
+            for start, end in self._changed_runs(shown, data):
+                self._tx_buf += command_table[0x80 + 0x40 * y + x + start]
+                self._tx_buf += b"".join(data_table[byte] for byte in data[start:end])
+            self._flush()
+            self._shadow[y][x : x + len(data)] = data
         except Exception:
+            self._shadow[y][x : x + len(data)] = [self._UNKNOWN] * len(data)
             self.logger.exception("Error writing text to LCD display!")
 
     def set_backlight(self, enabled: bool) -> None:
@@ -135,6 +197,9 @@ class LCD1602(BaseElectronicsComponent):
 
         :param bool enabled: True to enable backlight, False to disable.
         """
+        if enabled == self.backlight_enabled:
+            return
+
         self.backlight_enabled = enabled
         if enabled:
             self.bus.write_byte(self.address, 0x08)  # type: ignore[union-attr]
@@ -146,8 +211,8 @@ class LCD1602(BaseElectronicsComponent):
         try:
             self.set_backlight(False)
             if self.bus:
-                self.bus.close()
                 self.bus = None
+                release_bus(self.bus_number)
             self.logger.info("LCD1602 cleanup complete.")
         except Exception:
             self.logger.exception("Error during LCD cleanup!")
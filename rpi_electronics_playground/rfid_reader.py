@@ -1,8 +1,10 @@
 """RFID reader/writer module for MFRC522."""
 
+import threading
 import time
 
 from mfrc522 import SimpleMFRC522
+from RPi import GPIO
 
 from rpi_electronics_playground.base_component import BaseElectronicsComponent
 
@@ -10,13 +12,75 @@ from rpi_electronics_playground.base_component import BaseElectronicsComponent
 class RFIDReader(BaseElectronicsComponent):
     """Class for handling RFID operations using MFRC522."""
 
-    def __init__(self) -> None:
-        """Initialize the RFID reader."""
+    POLL_INTERVAL = 0.1
+    IRQ_ENABLE = 0xA0  # Receive interrupt only, inverted so the IRQ pin is active low
+    RST_PIN_BOARD = 22  # Reset pin the MFRC522 library sets up in BOARD numbering
+    RST_PIN_BCM = 15  # Reset pin the MFRC522 library sets up in BCM numbering
+
+    def __init__(self, irq_pin: int | None = None) -> None:
+        """Initialize the RFID reader.
+
+        :param int | None irq_pin: GPIO pin wired to the MFRC522 IRQ output, numbered in the GPIO mode
+            in use (BOARD unless set beforehand). If None, blocking reads poll the reader instead.
+        """
+        self.irq_pin = irq_pin
+        self._card_event = threading.Event()
         super().__init__("RFIDReader")
 
     def _initialize_component(self) -> None:
         """Initialize the RFID reader hardware."""
         self.reader = SimpleMFRC522()
+        # After the library, which sets BOARD numbering if no mode is set, so irq_pin keeps its documented numbering
+        self._ensure_gpio_mode_set()
+        # The library sets up its reset pin itself, so claim it for cleanup to release in place of Close_MFRC522
+        self._claim_gpio_pin(self.RST_PIN_BCM if GPIO.getmode() == GPIO.BCM else self.RST_PIN_BOARD)
+
+        if self.irq_pin is not None:
+            self.reader.READER.Write_MFRC522(self.reader.READER.CommIEnReg, self.IRQ_ENABLE)
+            self._setup_gpio_pin(self.irq_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(self.irq_pin, GPIO.FALLING, callback=self._on_irq)
+
+    def _on_irq(self, channel: int) -> None:
+        """Handle a falling edge on the IRQ pin.
+
+        :param int channel: The GPIO pin that triggered the callback.
+        """
+        self._card_event.set()
+
+    def _request_card(self) -> None:
+        """Transmit a card request so that a card in the field raises the receive interrupt."""
+        reader = self.reader.READER
+        # Re-arm the receive interrupt, as every library transceive overwrites the interrupt enables
+        reader.Write_MFRC522(reader.CommIEnReg, self.IRQ_ENABLE)
+        reader.Write_MFRC522(reader.CommIrqReg, 0x7F)  # Clear interrupt flags
+        reader.Write_MFRC522(reader.FIFOLevelReg, 0x80)  # Flush FIFO
+        reader.Write_MFRC522(reader.FIFODataReg, reader.PICC_REQIDL)
+        reader.Write_MFRC522(reader.CommandReg, reader.PCD_TRANSCEIVE)
+        reader.Write_MFRC522(reader.BitFramingReg, 0x87)  # Start transmission of 7 bits
+
+    def _read_requested_card(self) -> tuple[int | None, str | None]:
+        """Read a card that has answered the request sent by `_request_card`.
+
+        The card is already in the READY state and would not answer a second request,
+        so this selects it directly instead of going through `read_no_block`.
+
+        :return: Tuple of (card_id, text), or (None, None) if the card could not be selected.
+        """
+        reader = self.reader.READER
+        status, uid = reader.MFRC522_Anticoll()
+        if status != reader.MI_OK:
+            return None, None
+
+        card_id = self.reader.uid_to_num(uid)
+        reader.MFRC522_SelectTag(uid)
+        status = reader.MFRC522_Auth(reader.PICC_AUTHENT1A, 11, self.reader.KEY, uid)
+        data = []
+        if status == reader.MI_OK:
+            for block_addr in self.reader.BLOCK_ADDRS:
+                if block := reader.MFRC522_Read(block_addr):
+                    data += block
+        reader.MFRC522_StopCrypto1()
+        return card_id, "".join(chr(byte) for byte in data)
 
     def read_card(self) -> tuple[int, str] | None:
         """Read data from an RFID card.
@@ -29,6 +93,34 @@ class RFIDReader(BaseElectronicsComponent):
             self.logger.exception("Error reading card!")
             return None
 
+    def read_card_blocking(self, timeout: float | None = None) -> tuple[int, str] | None:
+        """Wait for an RFID card and read its data without busy-polling the reader.
+
+        If an IRQ pin is configured, the thread sleeps until the reader signals a card.
+        Otherwise the reader is polled every POLL_INTERVAL seconds.
+
+        :param float | None timeout: Maximum time to wait in seconds, or None to wait indefinitely.
+        :return: Tuple of (card_id, text) if a card is read, None on timeout or error.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                if self.irq_pin is None:
+                    time.sleep(self.POLL_INTERVAL)
+                    card_id, text = self.reader.read_no_block()
+                else:
+                    self._card_event.clear()
+                    self._request_card()
+                    if not self._card_event.wait(self.POLL_INTERVAL):
+                        continue
+                    card_id, text = self._read_requested_card()
+
+                if card_id:
+                    return card_id, text
+        except Exception:
+            self.logger.exception("Error reading card!")
+        return None
+
     def write_card(self, text: str) -> bool:
         """Write data to an RFID card.
 
@@ -45,8 +137,11 @@ class RFIDReader(BaseElectronicsComponent):
 
     def _cleanup_component(self) -> None:
         """Clean up RFID reader resources."""
-        # The MFRC522 library doesn't require specific cleanup,
-        # but we ensure GPIO cleanup is handled by the base class
+        if self.irq_pin is not None:
+            GPIO.remove_event_detect(self.irq_pin)
+
+        # Close_MFRC522 would also run a global GPIO cleanup, so close SPI here and let cleanup release the claimed pins
+        self.reader.READER.spi.close()
 
 
 def debug() -> None:
@@ -55,7 +150,7 @@ def debug() -> None:
         try:
             while True:
                 rfid.logger.info("Place an RFID card near the reader...")
-                result = rfid.read_card()
+                result = rfid.read_card_blocking()
                 if result:
                     card_id, text = result
                     rfid.logger.info("Read from card - ID: %s, Text: %s", card_id, text.strip())
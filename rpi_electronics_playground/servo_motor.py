@@ -1,15 +1,50 @@
 """Servo motor control module for lock/unlock operations."""
 
+from __future__ import annotations
+
+import asyncio
 import time
 
 from RPi import GPIO
 
 from rpi_electronics_playground.base_component import BaseElectronicsComponent
 
+try:
+    import pigpio
+except ImportError:  # pigpio is optional, fall back to RPi.GPIO software PWM
+    pigpio = None
+
 
 class ServoMotor(BaseElectronicsComponent):
     """Class for controlling a servo motor as a lock mechanism."""
 
+    __slots__ = (
+        "_current_angle",
+        "_locked_duty",
+        "_pi",
+        "_pulse_offset",
+        "_pulse_span",
+        "_unlocked_duty",
+        "frequency",
+        "is_locked",
+        "locked_angle",
+        "max_pulse",
+        "min_pulse",
+        "pin",
+        "pwm",
+        "unlocked_angle",
+    )
+
+    MAX_ANGLE = 180
+
+    # 180 degrees of travel times 200us per duty cycle percent of the 20ms PWM period
+    _DUTY_DIVISOR = MAX_ANGLE * 200
+
+    FULL_SWEEP_SETTLE_TIME = 0.5  # Seconds to wait for a full 180 degree move
+    MIN_SETTLE_TIME = 0.05
+
+    HARDWARE_PWM_PINS = frozenset({12, 13, 18, 19})  # BCM pins routed to the PWM peripheral
+
     def __init__(
         self,
         pin: int = 18,
@@ -22,20 +57,29 @@ class ServoMotor(BaseElectronicsComponent):
         """Initialize the servo lock.
 
         :param int pin: GPIO pin number for servo control.
-        :param int locked_angle: Angle for locked position (0-180 degrees).
-        :param int unlocked_angle: Angle for unlocked position (0-180 degrees).
+        :param int locked_angle: Angle for locked position, clamped to 0-180 degrees.
+        :param int unlocked_angle: Angle for unlocked position, clamped to 0-180 degrees.
         :param int frequency: PWM frequency in Hz.
         :param int min_pulse: Minimum pulse width in microseconds.
         :param int max_pulse: Maximum pulse width in microseconds.
         """
         self.pin = pin
-        self.locked_angle = locked_angle
-        self.unlocked_angle = unlocked_angle
+        self.locked_angle = self._clamp_angle(locked_angle)
+        self.unlocked_angle = self._clamp_angle(unlocked_angle)
         self.frequency = frequency
         self.min_pulse = min_pulse
         self.max_pulse = max_pulse
+
+        # Integer coefficients for the fused angle to duty cycle mapping
+        self._pulse_span = max_pulse - min_pulse
+        self._pulse_offset = self.MAX_ANGLE * min_pulse
+        self._locked_duty = self._angle_to_duty_cycle(self.locked_angle)
+        self._unlocked_duty = self._angle_to_duty_cycle(self.unlocked_angle)
+
         self.pwm: GPIO.PWM | None = None
+        self._pi: pigpio.pi | None = None
         self.is_locked = True
+        self._current_angle = self.locked_angle
 
         super().__init__("ServoMotor")
 
@@ -44,13 +88,28 @@ class ServoMotor(BaseElectronicsComponent):
         self._ensure_gpio_mode_set()
         self._setup_gpio_pin(self.pin, GPIO.OUT, GPIO.LOW)
 
-        if pwm := GPIO.PWM(self.pin, self.frequency):
+        if pigpio is not None and self.pin in self.HARDWARE_PWM_PINS:
+            self._setup_hardware_pwm()
+
+        if self._pi is None and (pwm := GPIO.PWM(self.pin, self.frequency)):
             self.pwm = pwm
             self.pwm.start(0)
 
         # Move to locked position
         self._lock()
 
+    def _setup_hardware_pwm(self) -> None:
+        """Generate the servo signal with the hardware PWM peripheral via pigpio, if its daemon is running."""
+        pi = pigpio.pi()
+        if not pi.connected:
+            self.logger.warning("pigpio daemon not running, falling back to software PWM")
+            pi.stop()
+            return
+
+        pi.hardware_PWM(self.pin, self.frequency, 0)
+        self._pi = pi
+        self.logger.debug("Servo driven by hardware PWM on pin %d", self.pin)
+
     @staticmethod
     def _map_value(
         value: int,
@@ -62,40 +121,122 @@ class ServoMotor(BaseElectronicsComponent):
         """Map a value from one range to another."""
         return int((out_max - out_min) * (value - in_min) / (in_max - in_min) + out_min)
 
+    @classmethod
+    def _clamp_angle(cls, angle: int) -> int:
+        """Clamp an angle to the servo's travel.
+
+        :param int angle: Angle in degrees.
+        :return int: Angle within 0-MAX_ANGLE degrees.
+        """
+        return 0 if angle < 0 else cls.MAX_ANGLE if angle > cls.MAX_ANGLE else angle
+
+    def _angle_to_duty_cycle(self, angle: int) -> int:
+        """Convert an angle to a PWM duty cycle with a single integer division.
+
+        Equivalent to mapping the angle to a pulse width and the pulse width to a duty cycle, truncating both.
+
+        :param int angle: Target angle (0-180 degrees).
+        :return int: Duty cycle percentage.
+        """
+        return (angle * self._pulse_span + self._pulse_offset) // self._DUTY_DIVISOR
+
+    def _angle_to_pulse_width(self, angle: int) -> int:
+        """Convert an angle to a pulse width with a single integer division.
+
+        :param int angle: Target angle (0-180 degrees).
+        :return int: Pulse width in microseconds.
+        """
+        return (angle * self._pulse_span + self._pulse_offset) // self.MAX_ANGLE
+
     def _set_angle(self, angle: int) -> None:
         """Set the servo to a specific angle.
 
-        :param int angle: Target angle (0-180 degrees).
+        :param int angle: Target angle, clamped to 0-180 degrees.
         """
-        angle = max(0, min(180, angle))
-        pulse_width = self._map_value(angle, 0, 180, self.min_pulse, self.max_pulse)
-        duty_cycle = self._map_value(pulse_width, 0, 20000, 0, 100)
+        angle = self._clamp_angle(angle)
+        self._move(angle, self._angle_to_duty_cycle(angle))
 
-        if self.pwm:
+    def _start_move(self, angle: int, duty_cycle: int) -> float:
+        """Drive the servo towards an angle and work out how long it needs to get there.
+
+        :param int angle: Target angle (0-180 degrees).
+        :param int duty_cycle: Duty cycle percentage for the target angle, used by software PWM.
+        :return float: Seconds to wait for the servo to settle, or 0.0 if PWM is not running.
+        """
+        if self._pi is not None:
+            # pigpio takes the duty cycle in parts per million, which is the pulse width in us times the frequency,
+            # so work from the pulse width to keep microsecond resolution rather than whole percent steps
+            self._pi.hardware_PWM(self.pin, self.frequency, self._angle_to_pulse_width(angle) * self.frequency)
+        elif self.pwm:
             self.pwm.ChangeDutyCycle(duty_cycle)
-            time.sleep(0.5)
+        else:
+            return 0.0
+
+        travel = abs(angle - self._current_angle)
+        self._current_angle = angle
+        return max(self.MIN_SETTLE_TIME, travel / self.MAX_ANGLE * self.FULL_SWEEP_SETTLE_TIME)
+
+    def _move(self, angle: int, duty_cycle: int) -> None:
+        """Move the servo to an angle and wait for it to settle.
+
+        :param int angle: Target angle (0-180 degrees).
+        :param int duty_cycle: Duty cycle percentage for the target angle.
+        """
+        if settle_time := self._start_move(angle, duty_cycle):
+            time.sleep(settle_time)
+
+    async def _move_async(self, angle: int, duty_cycle: int) -> None:
+        """Move the servo to an angle and wait for it to settle without blocking the event loop.
+
+        :param int angle: Target angle (0-180 degrees).
+        :param int duty_cycle: Duty cycle percentage for the target angle.
+        """
+        if settle_time := self._start_move(angle, duty_cycle):
+            await asyncio.sleep(settle_time)
+
+    def _transition(self, *, locked: bool) -> tuple[int, int] | None:
+        """Record a change of lock state and work out the move it needs.
+
+        The state is recorded as the move starts, so a toggle made while the servo is still moving reverses it.
+
+        :param bool locked: Whether to lock or unlock the mechanism.
+        :return tuple[int, int] | None: The (angle, duty_cycle) to move to, or None if already in that state.
+        """
+        if self.is_locked == locked:
+            return None
+
+        self.is_locked = locked
+        return (self.locked_angle, self._locked_duty) if locked else (self.unlocked_angle, self._unlocked_duty)
 
     def _lock(self) -> None:
         """Lock the mechanism by moving to locked position."""
-        if not self.is_locked:
-            self._set_angle(self.locked_angle)
-            self.is_locked = True
+        if move := self._transition(locked=True):
+            self._move(*move)
 
     def _unlock(self) -> None:
         """Unlock the mechanism by moving to unlocked position."""
-        if self.is_locked:
-            self._set_angle(self.unlocked_angle)
-            self.is_locked = False
+        if move := self._transition(locked=False):
+            self._move(*move)
 
     def toggle(self) -> None:
-        """Toggle between locked and unlocked states."""
-        if self.is_locked:
-            self._unlock()
-        else:
-            self._lock()
+        """Toggle between locked and unlocked states.
+
+        This blocks while the servo moves; from asyncio code, prefer `toggle_async`.
+        """
+        if move := self._transition(locked=not self.is_locked):
+            self._move(*move)
+
+    async def toggle_async(self) -> None:
+        """Toggle between locked and unlocked states without blocking the event loop."""
+        if move := self._transition(locked=not self.is_locked):
+            await self._move_async(*move)
 
     def _cleanup_component(self) -> None:
         """Clean up PWM resources."""
+        if self._pi is not None:
+            self._pi.hardware_PWM(self.pin, 0, 0)
+            self._pi.stop()
+            self._pi = None
         if self.pwm:
             self.pwm.stop()
             self.pwm = None
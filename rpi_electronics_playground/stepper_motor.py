@@ -6,23 +6,35 @@ from RPi import GPIO
 
 from rpi_electronics_playground.base_component import BaseElectronicsComponent
 
+# Coil states (IN1, IN2, IN3, IN4) for each phase of one step
+_CW_PHASES = tuple(tuple(int(bool((0x99 >> j) & (0x08 >> i))) for i in range(4)) for j in range(4))
+_CCW_PHASES = tuple(tuple(int(bool((0x99 << j) & (0x80 >> i))) for i in range(4)) for j in range(4))
+
 
 class StepperMotor(BaseElectronicsComponent):
     """Class for controlling a 28BYJ-48 stepper motor with ULN2003 driver."""
 
+    __slots__ = ("_pin_list", "motor_pins", "realtime", "rpm", "step_speed", "steps_per_revolution")
+
+    SPIN_THRESHOLD = 0.0003  # Busy-wait the final 300us of each phase to absorb sleep wake-up latency
+
     def __init__(
         self,
         motor_pins: tuple[int, int, int, int] = (18, 23, 24, 25),
         rpm: int = 15,
         steps_per_revolution: int = 2048,
+        *,
+        realtime: bool = False,
     ) -> None:
         """Initialize the stepper motor.
 
         :param tuple[int, int, int, int] motor_pins: GPIO pins for motor control (IN1, IN2, IN3, IN4).
         :param int rpm: Rotations per minute.
         :param int steps_per_revolution: Number of steps for a full revolution.
+        :param bool realtime: Whether to drive the coils under real-time scheduling to reduce step jitter.
         """
         self.motor_pins = motor_pins
+        self.realtime = realtime
         self.rpm = rpm
         self.steps_per_revolution = steps_per_revolution
         self.step_speed = (60 / rpm) / steps_per_revolution
@@ -31,11 +43,11 @@ class StepperMotor(BaseElectronicsComponent):
 
     def _initialize_component(self) -> None:
         """Initialize the motor GPIO pins."""
-        GPIO.setwarnings(False)
         self._ensure_gpio_mode_set()
 
         for pin in self.motor_pins:
             self._setup_gpio_pin(pin, GPIO.OUT, GPIO.LOW)
+        self._pin_list = list(self.motor_pins)
 
         self.logger.info(
             "Stepper motor initialized on pins %s at %d RPM",
@@ -43,19 +55,47 @@ class StepperMotor(BaseElectronicsComponent):
             self.rpm,
         )
 
+    def _drive(self, phases: tuple[tuple[int, ...], ...], steps: int) -> None:
+        """Drive the coils through a phase sequence for a number of steps.
+
+        Deadlines run continuously from the first phase, so wake-up latency in one step does not shift the rest.
+
+        :param tuple[tuple[int, ...], ...] phases: Coil states for each phase of one step.
+        :param int steps: Number of steps to execute.
+        """
+        # Bind hot lookups to locals so each phase is one output call and one wait
+        output = GPIO.output
+        pins = self._pin_list
+        step_speed = self.step_speed
+        wait_until = self._wait_until
+
+        with self._realtime_section():
+            deadline = time.perf_counter()
+            for _ in range(steps):
+                for phase in phases:
+                    output(pins, phase)
+                    deadline += step_speed
+                    wait_until(deadline)
+
+    def _wait_until(self, deadline: float) -> None:
+        """Sleep until just before a deadline, then spin for the remainder.
+
+        :param float deadline: Target time as a `time.perf_counter` value.
+        """
+        clock = time.perf_counter
+        remaining = deadline - clock()
+        if remaining > self.SPIN_THRESHOLD:
+            time.sleep(remaining - self.SPIN_THRESHOLD)
+        while clock() < deadline:
+            pass
+
     def _step_clockwise(self) -> None:
         """Execute one step in clockwise direction."""
-        for j in range(4):
-            for i in range(4):
-                GPIO.output(self.motor_pins[i], 0x99 >> j & (0x08 >> i))
-            time.sleep(self.step_speed)
+        self._drive(_CW_PHASES, 1)
 
     def _step_counterclockwise(self) -> None:
         """Execute one step in counterclockwise direction."""
-        for j in range(4):
-            for i in range(4):
-                GPIO.output(self.motor_pins[i], 0x99 << j & (0x80 >> i))
-            time.sleep(self.step_speed)
+        self._drive(_CCW_PHASES, 1)
 
     def rotate_clockwise(self, steps: int) -> None:
         """Rotate the motor clockwise for a specified number of steps.
@@ -64,8 +104,7 @@ class StepperMotor(BaseElectronicsComponent):
         """
         try:
             self.logger.info("Rotating motor %d steps clockwise", steps)
-            for _ in range(steps):
-                self._step_clockwise()
+            self._drive(_CW_PHASES, steps)
         except Exception:
             self.logger.exception("Error during clockwise rotation!")
             raise
@@ -77,8 +116,7 @@ class StepperMotor(BaseElectronicsComponent):
         """
         try:
             self.logger.info("Rotating motor %d steps counterclockwise", steps)
-            for _ in range(steps):
-                self._step_counterclockwise()
+            self._drive(_CCW_PHASES, steps)
         except Exception:
             self.logger.exception("Error during counterclockwise rotation!")
             raise
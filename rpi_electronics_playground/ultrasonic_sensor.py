@@ -1,17 +1,121 @@
 """Ultrasonic sensor control module for HC-SR04."""
 
-import statistics
+from __future__ import annotations
+
+import threading
 import time
 from collections import deque
+from collections.abc import Callable
+from functools import partial
 
 from RPi import GPIO
 
 from rpi_electronics_playground.base_component import BaseElectronicsComponent
 
+try:
+    import pigpio
+except ImportError:  # pigpio is optional, fall back to polling the echo pin with RPi.GPIO
+    pigpio = None
+
+# Speed of sound is 343 m/s = 34300 cm/s. Distances are computed in hundredths of a centimetre with integer
+# arithmetic as pulse * 34300 / divisor, where each divisor halves for the round trip and converts the time unit.
+_SPEED_OF_SOUND_CM_S = 34300
+_CM_X100_DIVISOR_US = 2 * 1_000_000 // 100
+_CM_X100_DIVISOR_NS = 2 * 1_000_000_000 // 100
+
+
+def _median3(a: float, b: float, c: float) -> float:
+    """Return the median of three readings with a compare network.
+
+    :param float a: First reading.
+    :param float b: Second reading.
+    :param float c: Third reading.
+    :return float: The median reading.
+    """
+    if b < a:
+        a, b = b, a
+    if b <= c:
+        return b
+    return c if a < c else a
+
+
+def _median5(a: float, b: float, c: float, d: float, e: float) -> float:
+    """Return the median of five readings with a six-compare network.
+
+    :param float a: First reading.
+    :param float b: Second reading.
+    :param float c: Third reading.
+    :param float d: Fourth reading.
+    :param float e: Fifth reading.
+    :return float: The median reading.
+    """
+    if b < a:
+        a, b = b, a
+    if d < c:
+        c, d = d, c
+    # The smaller of the two pair minimums cannot be the median, so drop it and bring in the fifth reading
+    if c < a:
+        b, d = d, b
+        c = a
+    a = e
+    if b < a:
+        a, b = b, a
+    if a < c:
+        b, d = d, b
+        a = c
+    return d if d < a else a
+
+
+# Compare networks for the common odd sample counts, faster than sorting for these sizes
+_MEDIAN_NETWORKS: dict[int, Callable[..., float]] = {3: _median3, 5: _median5}
+
+
+def _median(values: list[float]) -> float:
+    """Return the median of a short list of readings.
+
+    :param list[float] values: Readings to take the median of, must not be empty.
+    :return float: The median reading.
+    """
+    if (network := _MEDIAN_NETWORKS.get(len(values))) is not None:
+        return network(*values)
+
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    if len(ordered) & 1:
+        return ordered[mid]
+    return 0.5 * (ordered[mid - 1] + ordered[mid])
+
 
 class UltrasonicSensor(BaseElectronicsComponent):
     """Class for controlling an HC-SR04 ultrasonic sensor with improved accuracy."""
 
+    __slots__ = (
+        "_echo_callback",
+        "_echo_event",
+        "_latest_distance",
+        "_pi",
+        "_pulse_us",
+        "_rise_tick",
+        "_sampler",
+        "_stop_sampling",
+        "_trig_high",
+        "_trig_low",
+        "background",
+        "echo_pin",
+        "filter_size",
+        "last_stable_reading",
+        "outlier_threshold",
+        "readings_buffer",
+        "realtime",
+        "sample_count",
+        "trig_pin",
+    )
+
+    TRIGGER_PULSE_US = 10
+    ECHO_TIMEOUT = 0.04  # Longer than the ~38ms echo the HC-SR04 returns when nothing is in range
+    MIN_IQR_SAMPLES = 4  # Fewest readings for which quartile-based outlier rejection is meaningful
+    BACKGROUND_INTERVAL = 0.02  # Pause between background measurements
+
     def __init__(
         self,
         trig_pin: int = 5,
@@ -19,6 +123,9 @@ class UltrasonicSensor(BaseElectronicsComponent):
         sample_count: int = 5,
         filter_size: int = 10,
         outlier_threshold: float = 5.0,
+        *,
+        realtime: bool = False,
+        background: bool = False,
     ) -> None:
         """Initialize the ultrasonic sensor.
 
@@ -26,18 +133,36 @@ class UltrasonicSensor(BaseElectronicsComponent):
         :param int echo_pin: GPIO pin for echo signal.
         :param int sample_count: Number of samples to average per reading.
         :param int filter_size: Size of moving average filter.
-        :param float outlier_threshold: Maximum deviation (cm) for outlier rejection.
+        :param float outlier_threshold: Minimum distance (cm) of the outlier fences from the sample quartiles.
+        :param bool realtime: Whether to time echo pulses under real-time scheduling to reduce jitter.
+        :param bool background: Whether to measure continuously on a background thread, so `get_distance` returns
+            the latest filtered distance immediately.
         """
         self.trig_pin = trig_pin
         self.echo_pin = echo_pin
         self.sample_count = sample_count
         self.filter_size = filter_size
         self.outlier_threshold = outlier_threshold
+        self.realtime = realtime
+        self.background = background
+
+        # Echo timing from pigpio edge callbacks, when the pigpio daemon is available
+        self._pi: pigpio.pi | None = None
+        self._echo_callback: pigpio._callback | None = None
+        self._echo_event = threading.Event()
+        self._rise_tick = 0
+        self._pulse_us = 0
 
         # Initialize moving average filter
         self.readings_buffer: deque[float] = deque(maxlen=filter_size)
+        # Public and read-only: the latest filtered distance before rounding, or None until one is measured
         self.last_stable_reading: float | None = None
 
+        # Background sampling, owned by the sampler thread when enabled
+        self._sampler: threading.Thread | None = None
+        self._stop_sampling = threading.Event()
+        self._latest_distance = -1.0
+
         super().__init__("UltrasonicSensor")
 
     def _initialize_component(self) -> None:
@@ -46,97 +171,176 @@ class UltrasonicSensor(BaseElectronicsComponent):
         self._setup_gpio_pin(self.trig_pin, GPIO.OUT, GPIO.LOW)
         self._setup_gpio_pin(self.echo_pin, GPIO.IN)
 
+        # Pre-bound trigger writes, so a measurement makes one call per write instead of repeated attribute lookups
+        self._trig_high = partial(GPIO.output, self.trig_pin, GPIO.HIGH)
+        self._trig_low = partial(GPIO.output, self.trig_pin, GPIO.LOW)
+
+        if pigpio is not None:
+            self._setup_pigpio()
+
+        if self.background:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_continuously, name="UltrasonicSampler", daemon=True)
+            self._sampler.start()
+
         self.logger.info("Ultrasonic sensor initialized on pins TRIG=%d, ECHO=%d", self.trig_pin, self.echo_pin)
 
-    def _get_single_distance(self) -> float:
-        """Get a single distance measurement.
+    def _sample_continuously(self) -> None:
+        """Keep the latest filtered distance fresh until the sensor is cleaned up."""
+        while not self._stop_sampling.is_set():
+            self._latest_distance = self._measure_distance()
+            self._stop_sampling.wait(self.BACKGROUND_INTERVAL)
+
+    def _setup_pigpio(self) -> None:
+        """Time echo pulses with pigpio edge callbacks instead of polling, if the pigpio daemon is running."""
+        pi = pigpio.pi()
+        if not pi.connected:
+            self.logger.warning("pigpio daemon not running, falling back to polling the echo pin")
+            pi.stop()
+            return
+
+        pi.set_mode(self.echo_pin, pigpio.INPUT)
+        self._echo_callback = pi.callback(self.echo_pin, pigpio.EITHER_EDGE, self._on_echo_edge)
+        self._pi = pi
+        self.logger.debug("Echo pulses timed by pigpio edge callbacks")
+
+    def _on_echo_edge(self, _gpio: int, level: int, tick: int) -> None:
+        """Record echo edge timestamps from pigpio.
+
+        :param int _gpio: The GPIO pin that changed.
+        :param int level: 1 for a rising edge, 0 for a falling edge, 2 for a watchdog timeout.
+        :param int tick: Microseconds since boot when the edge was sampled.
+        """
+        if level == 1:
+            self._rise_tick = tick
+        elif level == 0:
+            self._pulse_us = pigpio.tickDiff(self._rise_tick, tick)
+            self._echo_event.set()
+
+    def _get_single_distance_pigpio(self, pi: pigpio.pi) -> float:
+        """Get a single distance measurement timed by pigpio edge callbacks.
 
+        :param pigpio.pi pi: Connection to the pigpio daemon.
         :return float: Distance in centimeters, or -1.0 if measurement failed.
         """
-        timeout = 0.5  # seconds
         try:
-            # Send trigger pulse
-            GPIO.output(self.trig_pin, GPIO.LOW)
-            time.sleep(0.000002)
-
-            GPIO.output(self.trig_pin, GPIO.HIGH)
-            time.sleep(0.00001)
-            GPIO.output(self.trig_pin, GPIO.LOW)
-
-            # Wait for echo response
-            pulse_start = time.time()
-            timeout_start = pulse_start
-
-            # Wait for echo to go HIGH (start of return signal)
-            while GPIO.input(self.echo_pin) == GPIO.LOW:
-                pulse_start = time.time()
-                # Timeout after 0.5 seconds to prevent infinite loop
-                if pulse_start - timeout_start > timeout:
-                    return -1.0
-
-            # Wait for echo to go LOW (end of return signal)
-            pulse_end = time.time()
-            timeout_end = pulse_end
-
-            while GPIO.input(self.echo_pin) == GPIO.HIGH:
-                pulse_end = time.time()
-                # Timeout after 0.5 seconds to prevent infinite loop
-                if pulse_end - timeout_end > timeout:
-                    return -1.0
-
-            # Calculate distance
-            pulse_duration = pulse_end - pulse_start
-            # Speed of sound is 343 m/s = 34300 cm/s
-            # Distance = (Time x Speed) / 2 (divide by 2 for round trip)
-            distance = (pulse_duration * 34300) / 2
-
-            return round(distance, 2)
+            self._echo_event.clear()
+            pi.gpio_trigger(self.trig_pin, self.TRIGGER_PULSE_US, 1)
+            if not self._echo_event.wait(self.ECHO_TIMEOUT):
+                return -1.0
+
+            # Round half up to 2 decimal places without a float round trip
+            cm_x100 = (self._pulse_us * _SPEED_OF_SOUND_CM_S + _CM_X100_DIVISOR_US // 2) // _CM_X100_DIVISOR_US
+            return cm_x100 / 100
 
         except Exception:
             return -1.0
 
-    def _is_outlier(self, reading: float) -> bool:
-        """Check if a reading is an outlier.
+    def _get_single_distance(self) -> float:
+        """Get a single distance measurement.
 
-        :param float reading: The reading to check.
-        :return bool: True if reading is an outlier.
+        :return float: Distance in centimeters, or -1.0 if measurement failed.
         """
-        if self.last_stable_reading is None:
-            return False
+        if self._pi is not None:
+            return self._get_single_distance_pigpio(self._pi)
+
+        # Bind hot lookups to locals so the polling loops sample the echo pin as often as possible
+        clock = time.monotonic_ns
+        read = GPIO.input
+        trig_high = self._trig_high
+        trig_low = self._trig_low
+        echo = self.echo_pin
+        low = GPIO.LOW
+        high = GPIO.HIGH
+        # Same pulse and timeout as the pigpio path, in the clock's units. The trigger pulse is busy-waited since
+        # sleeps this short overshoot, and waiting past the echo timeout would only busy-spin, possibly at real-time
+        # priority
+        trigger_pulse_ns = self.TRIGGER_PULSE_US * 1_000
+        echo_timeout_ns = int(self.ECHO_TIMEOUT * 1_000_000_000)
+
+        try:
+            with self._realtime_section():
+                # Send trigger pulse, the GPIO write itself covers the 2us low settle time
+                trig_low()
+                trig_high()
+                pulse_deadline = clock() + trigger_pulse_ns
+                while clock() < pulse_deadline:
+                    pass
+                trig_low()
+
+                # Time the echo in one loop, stamping the rising and falling edges as they are seen so no edge can
+                # fall between two separate polling loops, and timing out to prevent an infinite loop
+                deadline = clock() + echo_timeout_ns
+                pulse_start = -1
+                while True:
+                    level = read(echo)
+                    now = clock()
+                    if pulse_start < 0:
+                        if level == high:
+                            pulse_start = now
+                    elif level == low:
+                        pulse_end = now
+                        break
+                    if now > deadline:
+                        return -1.0
+
+            # Calculate distance from the integer pulse width, rounded half up to 2 decimal places
+            cm_x100 = (
+                (pulse_end - pulse_start) * _SPEED_OF_SOUND_CM_S + _CM_X100_DIVISOR_NS // 2
+            ) // _CM_X100_DIVISOR_NS
+            return cm_x100 / 100
+
+        except Exception:
+            return -1.0
 
-        # Be more lenient with outlier detection when we have few readings
-        buffer_size = len(self.readings_buffer)
-        if buffer_size < 3:  # noqa: PLR2004
-            # Use a larger threshold when we don't have much data
-            adaptive_threshold = self.outlier_threshold * 2
-        else:
-            adaptive_threshold = self.outlier_threshold
+    def _reject_outliers(self, readings: list[float]) -> list[float]:
+        """Drop readings outside the interquartile fences of the batch.
 
-        deviation = abs(reading - self.last_stable_reading)
-        return deviation > adaptive_threshold
+        The fences sit 1.5 IQR beyond the quartiles, but never closer than `outlier_threshold`, so a tightly
+        clustered batch does not reject readings that differ by a few millimetres.
+
+        :param list[float] readings: Valid readings from one acquisition.
+        :return list[float]: The readings within the fences, sorted, or the readings unchanged if too few for quartiles.
+        """
+        if len(readings) < self.MIN_IQR_SAMPLES:
+            return readings
+
+        ordered = sorted(readings)
+        last = len(ordered) - 1
+        q1 = ordered[last // 4]
+        q3 = ordered[(3 * last) // 4]
+        fence = max(1.5 * (q3 - q1), self.outlier_threshold)
+        low = q1 - fence
+        high = q3 + fence
+        return [reading for reading in ordered if low <= reading <= high]
 
     def get_distance(self) -> float:
         """Measure distance using the ultrasonic sensor with improved accuracy.
 
         Uses multiple samples, outlier rejection, and moving average filtering
-        to provide more stable and accurate readings.
+        to provide more stable and accurate readings. In background mode, returns
+        the latest distance from the sampler thread without waiting.
+
+        :return float: Distance in centimeters, or -1.0 if no valid measurement is available.
+        """
+        if self._sampler is not None:
+            return self._latest_distance
+        return self._measure_distance()
+
+    def _measure_distance(self) -> float:
+        """Take a batch of samples and update the moving average filter.
 
         :return float: Distance in centimeters.
         """
         try:
-            # Take multiple samples and filter out bad readings
+            # Take multiple samples, retrying failed measurements
             valid_readings = []
 
             for _ in range(self.sample_count * 2):
                 reading = self._get_single_distance()
 
                 if reading > 0:  # Valid reading
-                    # Check for outliers only if we have a reference
-                    if not self._is_outlier(reading):
-                        valid_readings.append(reading)
-                    # Even outliers can be useful if we don't have many readings
-                    elif len(valid_readings) < 2:  # noqa: PLR2004
-                        valid_readings.append(reading)
+                    valid_readings.append(reading)
 
                     if len(valid_readings) >= self.sample_count:
                         break
@@ -153,21 +357,22 @@ class UltrasonicSensor(BaseElectronicsComponent):
                 filtered_distance = valid_readings[0]
                 self.logger.debug("Using single reading: %.1f cm", filtered_distance)
             else:
-                # Multiple readings - use median for robustness
-                filtered_distance = statistics.median(valid_readings)
+                # Multiple readings - reject outliers across the batch, then use median for robustness
+                filtered_distance = _median(self._reject_outliers(valid_readings))
 
             # Add to moving average buffer
             self.readings_buffer.append(filtered_distance)
 
             # Calculate moving average with more lenient requirements
             if len(self.readings_buffer) >= 2:  # noqa: PLR2004
-                smoothed_distance = statistics.mean(self.readings_buffer)
+                # Built-in float sum avoids statistics.mean's exact Fraction arithmetic
+                smoothed_distance = sum(self.readings_buffer) / len(self.readings_buffer)
                 self.last_stable_reading = smoothed_distance
-                return float(round(smoothed_distance, 1))
+                return int(smoothed_distance * 10 + 0.5) / 10
 
             # First reading - return as-is
             self.last_stable_reading = filtered_distance
-            return float(round(filtered_distance, 1))
+            return int(filtered_distance * 10 + 0.5) / 10
 
         except Exception:
             self.logger.exception("Error measuring distance!")
@@ -175,7 +380,16 @@ class UltrasonicSensor(BaseElectronicsComponent):
 
     def _cleanup_component(self) -> None:
         """Clean up ultrasonic sensor resources."""
-        # No specific cleanup needed for ultrasonic sensor
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._echo_callback is not None:
+            self._echo_callback.cancel()
+            self._echo_callback = None
+        if self._pi is not None:
+            self._pi.stop()
+            self._pi = None
 
 
 def debug() -> None:
@@ -1,8 +1,11 @@
 """Test configuration and fixtures for the rpi_electronics_playground package."""
 
 import sys
+from collections.abc import Generator
 from unittest.mock import MagicMock
 
+import pytest
+
 
 class MockPWM:
     """Mock PWM class for GPIO PWM functionality."""
@@ -50,6 +53,11 @@ class MockGPIO:
         """Mock setmode function."""
         pass
 
+    @staticmethod
+    def setwarnings(flag: bool) -> None:
+        """Mock setwarnings function."""
+        pass
+
     @staticmethod
     def setup(pin: int, mode: str) -> None:
         """Mock setup function."""
@@ -82,33 +90,144 @@ class MockSMBus:
         """Mock write_byte method."""
         pass
 
+    def i2c_rdwr(self, *i2c_msgs: object) -> None:
+        """Mock i2c_rdwr method."""
+        pass
+
+    def close(self) -> None:
+        """Mock close method."""
+        pass
+
+
+class MockSpiDev:
+    """Mock SpiDev class for the SPI device used by the MFRC522."""
+
     def close(self) -> None:
         """Mock close method."""
         pass
 
 
+class MockMFRC522:
+    """Mock MFRC522 class listing the registers, constants and methods of the mfrc522 library."""
+
+    # Register addresses
+    CommandReg = 0x01
+    CommIEnReg = 0x02
+    CommIrqReg = 0x04
+    ErrorReg = 0x06
+    FIFODataReg = 0x09
+    FIFOLevelReg = 0x0A
+    BitFramingReg = 0x0D
+
+    # Command constants
+    PCD_IDLE = 0x00
+    PCD_TRANSCEIVE = 0x0C
+    PICC_REQIDL = 0x26
+    PICC_AUTHENT1A = 0x60
+
+    # Status constants
+    MI_OK = 0
+    MI_NOTAGERR = 1
+    MI_ERR = 2
+
+    def __init__(self) -> None:
+        """Initialize mock MFRC522."""
+        self.spi = MockSpiDev()
+
+    def Write_MFRC522(self, addr: int, val: int) -> None:  # noqa: N802
+        """Mock register write method."""
+        pass
+
+    def Read_MFRC522(self, addr: int) -> int:  # noqa: N802
+        """Mock register read method."""
+        return 0
+
+    def MFRC522_Request(self, req_mode: int) -> tuple[int, int]:  # noqa: N802
+        """Mock card request method."""
+        return (self.MI_OK, 0)
+
+    def MFRC522_Anticoll(self) -> tuple[int, list[int]]:  # noqa: N802
+        """Mock anticollision method."""
+        return (self.MI_OK, [0x12, 0x34, 0x56, 0x78, 0x08])
+
+    def MFRC522_SelectTag(self, ser_num: list[int]) -> int:  # noqa: N802
+        """Mock select method."""
+        return 0x08
+
+    def MFRC522_Auth(self, auth_mode: int, block_addr: int, key: list[int], ser_num: list[int]) -> int:  # noqa: N802
+        """Mock authentication method."""
+        return self.MI_OK
+
+    def MFRC522_Read(self, block_addr: int) -> list[int] | None:  # noqa: N802
+        """Mock block read method."""
+        return [0x20] * 16
+
+    def MFRC522_StopCrypto1(self) -> None:  # noqa: N802
+        """Mock method ending the authenticated session."""
+        pass
+
+    def Close_MFRC522(self) -> None:  # noqa: N802
+        """Mock close method."""
+        pass
+
+
 class MockSimpleMFRC522:
     """Mock SimpleMFRC522 class for RFID operations."""
 
+    KEY = (0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF)
+    BLOCK_ADDRS = (8, 9, 10)
+
     def __init__(self) -> None:
         """Initialize mock RFID reader."""
-        pass
+        self.READER = MockMFRC522()
 
     def read(self) -> tuple[int, str]:
         """Mock read method."""
         return (123456789, "test_data")
 
+    def read_no_block(self) -> tuple[int | None, str | None]:
+        """Mock non-blocking read method."""
+        return (123456789, "test_data")
+
     def write(self, text: str) -> None:
         """Mock write method."""
         pass
 
+    def uid_to_num(self, uid: list[int]) -> int:
+        """Mock method converting a card UID to its number."""
+        return 123456789
+
 
 mock_modules = {
     "RPi": MagicMock(),
     "RPi.GPIO": MockGPIO(),
     "smbus2": MagicMock(SMBus=MockSMBus),
-    "mfrc522": MagicMock(SimpleMFRC522=MockSimpleMFRC522),
+    "mfrc522": MagicMock(MFRC522=MockMFRC522, SimpleMFRC522=MockSimpleMFRC522),
 }
 
 for module_name, mock_module in mock_modules.items():
     sys.modules[module_name] = mock_module  # type: ignore[assignment]
+
+from rpi_electronics_playground import _i2c, base_component  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_gpio_state() -> Generator[None, None, None]:
+    """Fixture to forget the GPIO pins configured by previous tests."""
+    base_component._CONFIGURED_PINS.clear()
+    yield
+    base_component._CONFIGURED_PINS.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_i2c_buses() -> Generator[None, None, None]:
+    """Fixture to forget I2C bus handles opened by previous tests."""
+    _i2c._BUSES.clear()
+    yield
+    _i2c._BUSES.clear()
+
+
+@pytest.fixture(autouse=True)
+def fast_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fixture to make time.sleep a no-op, so code under test never waits in real time."""
+    monkeypatch.setattr("time.sleep", lambda *_args, **_kwargs: None)
@@ -1,11 +1,13 @@
 """Unit tests for the rpi_electronics_playground.base_component module."""
 
+import logging
 from collections.abc import Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from rpi_electronics_playground.base_component import BaseElectronicsComponent
+from rpi_electronics_playground import base_component
+from rpi_electronics_playground.base_component import BaseElectronicsComponent, _CachedTimeFormatter
 
 
 class MockComponent(BaseElectronicsComponent):
@@ -34,6 +36,41 @@ def mock_gpio() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def mock_os() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the os module's scheduling functions."""
+    with patch("rpi_electronics_playground.base_component.os") as mock:
+        mock.sched_getscheduler.return_value = 0
+        yield mock
+
+
+@pytest.fixture
+def mock_lock_memory() -> Generator[MagicMock, None, None]:
+    """Fixture to mock memory locking."""
+    with patch("rpi_electronics_playground.base_component._lock_memory") as mock:
+        yield mock
+
+
+class TestCachedTimeFormatter:
+    """Unit tests for the _CachedTimeFormatter class."""
+
+    def test_format_time_cached_per_second(self) -> None:
+        """Test that timestamps are only formatted once per second."""
+        formatter = _CachedTimeFormatter(fmt="%(asctime)s %(message)s", datefmt="%H:%M:%S")
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+
+        with patch("logging.Formatter.formatTime", return_value="12:00:00") as mock_format_time:
+            record.created = 100.1
+            first = formatter.formatTime(record, formatter.datefmt)
+            record.created = 100.9
+            second = formatter.formatTime(record, formatter.datefmt)
+            record.created = 101.0
+            formatter.formatTime(record, formatter.datefmt)
+
+        assert first == second == "12:00:00"
+        assert mock_format_time.call_count == 2
+
+
 class TestBaseElectronicsComponent:
     """Unit tests for the BaseElectronicsComponent class."""
 
@@ -45,16 +82,24 @@ class TestBaseElectronicsComponent:
         assert component.initialization_called is True
         assert component.component_name == "MockComponent"
 
+    def test_logger_is_cached(self, mock_gpio: MagicMock) -> None:
+        """Test that components with the same name share one configured logger."""
+        first = MockComponent()
+        second = MockComponent()
+
+        assert first.logger is second.logger
+        assert len(first.logger.handlers) == 1
+
     def test_cleanup(self, mock_gpio: MagicMock) -> None:
         """Test component cleanup functionality."""
         component = MockComponent()
 
         component.cleanup()
 
-        # Should call component-specific cleanup and GPIO.cleanup()
+        # Should call component-specific cleanup, with no pins of its own to release
         assert component.cleanup_called is True
         assert component.is_initialized is False
-        mock_gpio.cleanup.assert_called_once()
+        mock_gpio.cleanup.assert_not_called()
 
     def test_gpio_mode_already_set(self, mock_gpio: MagicMock) -> None:
         """Test GPIO mode handling when already set."""
@@ -65,14 +110,28 @@ class TestBaseElectronicsComponent:
         # Should not call setmode if already set
         mock_gpio.setmode.assert_not_called()
 
+    def test_gpio_mode_restored_after_external_cleanup(self, mock_gpio: MagicMock) -> None:
+        """Test GPIO mode is queried every time, so a cleanup outside the package does not leave it unset."""
+        component = MockComponent()
+        mock_gpio.getmode.return_value = mock_gpio.BCM
+        component._ensure_gpio_mode_set()
+        mock_gpio.setmode.assert_not_called()
+
+        # Something outside the package runs a global GPIO cleanup, resetting the mode
+        mock_gpio.getmode.return_value = None
+        component._ensure_gpio_mode_set()
+
+        mock_gpio.setmode.assert_called_once_with(mock_gpio.BCM)
+        assert mock_gpio.getmode.call_count == 2
+
     def test_setup_gpio_pin_with_mode_and_state(self, mock_gpio: MagicMock) -> None:
         """Test GPIO pin setup with mode and initial state."""
         component = MockComponent()
 
         component._setup_gpio_pin(18, mock_gpio.OUT, initial=mock_gpio.HIGH)
 
-        mock_gpio.setup.assert_called_with(18, mock_gpio.OUT)
-        mock_gpio.output.assert_called_with(18, mock_gpio.HIGH)
+        mock_gpio.setup.assert_called_with(18, mock_gpio.OUT, initial=mock_gpio.HIGH)
+        mock_gpio.output.assert_not_called()
 
     def test_setup_gpio_pin_with_mode_only(self, mock_gpio: MagicMock) -> None:
         """Test GPIO pin setup with mode only."""
@@ -81,3 +140,137 @@ class TestBaseElectronicsComponent:
         component._setup_gpio_pin(24, mock_gpio.IN)
 
         mock_gpio.setup.assert_called_with(24, mock_gpio.IN)
+
+    def test_setup_gpio_pin_with_pull_up_down(self, mock_gpio: MagicMock) -> None:
+        """Test GPIO pin setup with a pull resistor."""
+        component = MockComponent()
+
+        component._setup_gpio_pin(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_UP)
+
+        mock_gpio.setup.assert_called_with(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_UP)
+
+    def test_setup_gpio_pin_already_configured(self, mock_gpio: MagicMock) -> None:
+        """Test GPIO pin setup is skipped when the pin is already configured the same way."""
+        component = MockComponent()
+        component._setup_gpio_pin(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_UP)
+        mock_gpio.setup.reset_mock()
+
+        component._setup_gpio_pin(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_UP)
+        mock_gpio.setup.assert_not_called()
+
+        component._setup_gpio_pin(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_DOWN)
+        mock_gpio.setup.assert_called_once_with(24, mock_gpio.IN, pull_up_down=mock_gpio.PUD_DOWN)
+
+    def test_setup_gpio_pin_with_initial_always_configured(self, mock_gpio: MagicMock) -> None:
+        """Test GPIO pin setup with an initial state is never skipped, so the level is driven again."""
+        component = MockComponent()
+        component._setup_gpio_pin(18, mock_gpio.OUT, initial=mock_gpio.LOW)
+        component._setup_gpio_pin(18, mock_gpio.OUT, initial=mock_gpio.LOW)
+
+        assert mock_gpio.setup.call_count == 2
+
+    def test_gpio_mode_unset_forgets_configured_pins(self, mock_gpio: MagicMock) -> None:
+        """Test that finding the GPIO mode unset forgets pins configured before an external cleanup."""
+        component = MockComponent()
+        component._setup_gpio_pin(24, mock_gpio.IN)
+
+        component._ensure_gpio_mode_set()
+        component._setup_gpio_pin(24, mock_gpio.IN)
+
+        assert mock_gpio.setup.call_count == 2
+
+    def test_cleanup_forgets_configured_pins(self, mock_gpio: MagicMock) -> None:
+        """Test that cleanup forgets configured pins so they are set up again next time."""
+        component = MockComponent()
+        component._setup_gpio_pin(24, mock_gpio.IN)
+
+        component.cleanup()
+        MockComponent()._setup_gpio_pin(24, mock_gpio.IN)
+
+        assert mock_gpio.setup.call_count == 2
+
+    def test_cleanup_releases_component_pins(self, mock_gpio: MagicMock) -> None:
+        """Test that cleanup releases only the pins set up by the component in a single call."""
+        component = MockComponent()
+        component._setup_gpio_pin(18, mock_gpio.OUT, initial=mock_gpio.LOW)
+        component._setup_gpio_pin(24, mock_gpio.IN)
+
+        component.cleanup()
+
+        mock_gpio.cleanup.assert_called_once_with([18, 24])
+        assert component._gpio_pins == []
+
+    def test_cleanup_keeps_other_component_pins(self, mock_gpio: MagicMock) -> None:
+        """Test that cleanup leaves the pins of another live component configured."""
+        component = MockComponent()
+        component._setup_gpio_pin(18, mock_gpio.OUT, initial=mock_gpio.LOW)
+        other = MockComponent("OtherComponent")
+        other._setup_gpio_pin(24, mock_gpio.IN)
+
+        component.cleanup()
+
+        mock_gpio.cleanup.assert_called_once_with([18])
+        assert base_component._CONFIGURED_PINS == {24: (mock_gpio.IN, None, None)}
+        assert other._gpio_pins == [24]
+
+    def test_claim_gpio_pin(self, mock_gpio: MagicMock) -> None:
+        """Test that a pin set up outside the component is released by cleanup without being set up again."""
+        component = MockComponent()
+        component._claim_gpio_pin(22)
+        component._claim_gpio_pin(22)
+
+        component.cleanup()
+
+        mock_gpio.setup.assert_not_called()
+        mock_gpio.cleanup.assert_called_once_with([22])
+
+    def test_realtime_section_disabled(self, mock_gpio: MagicMock, mock_os: MagicMock) -> None:
+        """Test that the real-time section leaves scheduling untouched by default."""
+        component = MockComponent()
+
+        with component._realtime_section():
+            pass
+
+        mock_os.sched_setscheduler.assert_not_called()
+
+    def test_realtime_section_enabled(
+        self, mock_gpio: MagicMock, mock_os: MagicMock, mock_lock_memory: MagicMock
+    ) -> None:
+        """Test that the real-time section switches to SCHED_FIFO and restores the previous policy."""
+        component = MockComponent()
+        component.realtime = True
+
+        with component._realtime_section():
+            mock_os.sched_setscheduler.assert_called_once_with(
+                0, mock_os.SCHED_FIFO, mock_os.sched_param(base_component._REALTIME_PRIORITY)
+            )
+            mock_lock_memory.assert_called_once()
+
+        mock_os.sched_setscheduler.assert_called_with(0, 0, mock_os.sched_getparam.return_value)
+
+    def test_realtime_section_restores_on_error(
+        self, mock_gpio: MagicMock, mock_os: MagicMock, mock_lock_memory: MagicMock
+    ) -> None:
+        """Test that the previous policy is restored when the enclosed block raises."""
+        component = MockComponent()
+        component.realtime = True
+
+        msg = "boom"
+        with pytest.raises(ValueError, match=msg), component._realtime_section():
+            raise ValueError(msg)
+
+        assert mock_os.sched_setscheduler.call_count == 2
+
+    def test_realtime_section_without_permission(
+        self, mock_gpio: MagicMock, mock_os: MagicMock, mock_lock_memory: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that the section falls back to normal scheduling when real-time is not permitted."""
+        component = MockComponent()
+        component.realtime = True
+        mock_os.sched_setscheduler.side_effect = PermissionError
+
+        with caplog.at_level(logging.WARNING), component._realtime_section():
+            pass
+
+        assert "Real-time scheduling unavailable (requires root or CAP_SYS_NICE)" in caplog.messages
+        mock_lock_memory.assert_not_called()
@@ -0,0 +1,76 @@
+"""Unit tests for the rpi_electronics_playground._i2c module."""
+
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rpi_electronics_playground._i2c import get_bus, get_bus_clock_hz, release_bus
+
+
+@pytest.fixture
+def mock_smbus() -> Generator[MagicMock, None, None]:
+    """Fixture to mock smbus2.SMBus."""
+    with patch("rpi_electronics_playground._i2c.smbus.SMBus") as mock:
+        yield mock
+
+
+class TestI2CBus:
+    """Unit tests for the shared I2C bus handles."""
+
+    def test_get_bus_shares_handle(self, mock_smbus: MagicMock) -> None:
+        """Test that components on the same bus share one handle."""
+        first = get_bus(1)
+        second = get_bus(1)
+
+        assert first is second
+        mock_smbus.assert_called_once_with(1)
+
+    def test_get_bus_separate_buses(self, mock_smbus: MagicMock) -> None:
+        """Test that different bus numbers get different handles."""
+        mock_smbus.side_effect = lambda bus_number: MagicMock(name=f"bus{bus_number}")
+
+        assert get_bus(0) is not get_bus(1)
+        assert mock_smbus.call_count == 2
+
+    def test_release_bus_closes_when_unused(self, mock_smbus: MagicMock) -> None:
+        """Test that the bus is closed only when the last user releases it."""
+        bus = get_bus(1)
+        get_bus(1)
+
+        release_bus(1)
+        bus.close.assert_not_called()
+
+        release_bus(1)
+        bus.close.assert_called_once()
+
+        # The next user opens the bus again
+        get_bus(1)
+        assert mock_smbus.call_count == 2
+
+    def test_release_bus_not_open(self, mock_smbus: MagicMock) -> None:
+        """Test that releasing a bus that is not open does nothing."""
+        release_bus(1)
+
+        mock_smbus.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            ((100_000).to_bytes(4, "big"), 100_000),
+            ((400_000).to_bytes(4, "big"), 400_000),
+            (b"\x00", None),
+        ],
+    )
+    def test_get_bus_clock_hz(self, tmp_path: Path, data: bytes, expected: int | None) -> None:
+        """Test reading the bus clock from the device tree."""
+        (tmp_path / "i2c-1").write_bytes(data)
+
+        with patch("rpi_electronics_playground._i2c._CLOCK_FREQUENCY_PATH", str(tmp_path / "i2c-{bus_number}")):
+            assert get_bus_clock_hz(1) == expected
+
+    def test_get_bus_clock_hz_missing(self, tmp_path: Path) -> None:
+        """Test that a missing device tree property gives None."""
+        with patch("rpi_electronics_playground._i2c._CLOCK_FREQUENCY_PATH", str(tmp_path / "i2c-{bus_number}")):
+            assert get_bus_clock_hz(1) is None
@@ -2,75 +2,188 @@
 
 import logging
 from collections.abc import Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from smbus2 import SMBus
 
 from rpi_electronics_playground.lcd import LCD1602
 
 
-@pytest.fixture
-def mock_smbus() -> Generator[MagicMock, None, None]:
-    """Fixture to mock smbus2.SMBus."""
+@pytest.fixture(scope="module")
+def smbus_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock smbus2.SMBus once for every test in the module."""
     with patch("rpi_electronics_playground.lcd.smbus.SMBus") as mock:
-        mock_bus = MagicMock()
-        mock.return_value = mock_bus
-        yield mock_bus
+        # The bus is only called through its methods, so a spec'd Mock is enough and cheaper than a MagicMock
+        mock.return_value = Mock(spec=SMBus)
+        yield mock
+
+
+@pytest.fixture
+def mock_smbus(smbus_patch: MagicMock) -> Mock:
+    """Fixture to reset the shared smbus2.SMBus mock and return its bus."""
+    smbus_patch.reset_mock()
+    mock_bus: Mock = smbus_patch.return_value
+    mock_bus.reset_mock(return_value=True, side_effect=True)
+    return mock_bus
 
 
 @pytest.fixture(autouse=True)
+def mock_i2c_msg() -> Generator[MagicMock, None, None]:
+    """Fixture to mock smbus2.i2c_msg so that each message is its (address, payload) tuple."""
+    with patch("rpi_electronics_playground.lcd.smbus.i2c_msg") as mock:
+        mock.write.side_effect = lambda address, buf: (address, bytes(buf))
+        yield mock
+
+
+@pytest.fixture
 def mock_sleep() -> Generator[MagicMock, None, None]:
     """Fixture to mock time.sleep."""
     with patch("rpi_electronics_playground.lcd.time.sleep") as mock:
         yield mock
 
 
+@pytest.fixture
+def lcd(mock_smbus: MagicMock) -> LCD1602:
+    """Fixture for an LCD1602 created without sending the display initialization sequence."""
+    with patch.object(LCD1602, "_initialize_display"):
+        return LCD1602()
+
+
 class TestLCD1602:
     """Unit tests for the LCD1602 class."""
 
-    def test_clear(self, mock_smbus: MagicMock, mock_sleep: MagicMock) -> None:
-        """Test clear method."""
-        lcd = LCD1602()
-        mock_smbus.write_byte.reset_mock()
+    @pytest.mark.parametrize(
+        ("clock_hz", "should_warn"),
+        [
+            (100_000, True),
+            (400_000, False),
+        ],
+    )
+    def test_check_bus_clock(
+        self, mock_smbus: MagicMock, clock_hz: int, should_warn: bool, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a bus slower than the requested clock logs a warning."""
+        with (
+            patch("rpi_electronics_playground.lcd.get_bus_clock_hz", return_value=clock_hz),
+            caplog.at_level(logging.WARNING),
+        ):
+            LCD1602(i2c_clock_hz=400_000)
 
-        lcd.clear()
+        assert any("dtparam=i2c_arm_baudrate=400000" in message for message in caplog.messages) is should_warn
 
-        mock_smbus.write_byte.assert_called()
+    def test_initialize_display(self, mock_smbus: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test that the reset nibbles are sent one per transaction with their waits before any batched command."""
+        events: list[object] = []
+        mock_smbus.i2c_rdwr.side_effect = events.append
+        mock_sleep.side_effect = events.append
 
-    def test_clear_exception(
-        self, mock_smbus: MagicMock, mock_sleep: MagicMock, caplog: pytest.LogCaptureFixture
-    ) -> None:
-        """Test clear method when an exception occurs."""
         lcd = LCD1602()
-        mock_smbus.write_byte.side_effect = Exception("I2C error")
 
-        with caplog.at_level(logging.ERROR):
-            lcd.clear()
+        expected_events: list[object] = []
+        for nibble, delay in LCD1602._INIT_NIBBLES:
+            value = (nibble << 4) | 0x08
+            expected_events += [(lcd.address, bytes((value | 0x04, value))), delay]
+        expected_events.append((lcd.address, LCD1602._COMMAND_NIBBLES[True][0x28]))
+        assert events[: len(expected_events)] == expected_events
+        assert LCD1602._INIT_NIBBLES[0][1] > 0.0041
+        assert LCD1602._INIT_NIBBLES[1][1] > 0.0001
 
-        assert "Error clearing LCD display!" in caplog.text
+    def test_clear(self, mock_smbus: MagicMock, lcd: LCD1602, mock_sleep: MagicMock) -> None:
+        """Test clear method."""
+        lcd.write(0, 0, "Hello")
+        mock_smbus.i2c_rdwr.reset_mock()
+        mock_sleep.reset_mock()
+
+        lcd.clear()
 
-    def test_write(self, mock_smbus: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_smbus.i2c_rdwr.assert_called_once_with((lcd.address, bytes([0x0C, 0x08, 0x1C, 0x18])))
+        mock_sleep.assert_called_once_with(LCD1602.CLEAR_HOME_DELAY)
+        assert lcd._shadow[0] == [0x20] * 16
+
+    def test_write(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
         """Test write method."""
-        lcd = LCD1602()
-        mock_smbus.write_byte.reset_mock()
+        lcd.write(0, 0, "Hello")
+
+        # A single transaction holding the cursor command followed by all 20 data bytes
+        mock_smbus.i2c_rdwr.assert_called_once()
+        address, payload = mock_smbus.i2c_rdwr.call_args.args[0]
+        assert address == lcd.address
+        assert len(payload) == 24
+        assert payload[:4] == LCD1602._COMMAND_NIBBLES[True][0x80]
+        assert payload[4] == (ord("H") & 0xF0) | 0x0D
+
+    def test_write_full_line_single_transaction(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
+        """Test that a full line of text is sent as one I2C transaction."""
+        lcd.write(0, 0, "A" * 16)
+
+        mock_smbus.i2c_rdwr.assert_called_once()
+        assert len(mock_smbus.i2c_rdwr.call_args.args[0][1]) == 68
+        assert not lcd._tx_buf
 
+    def test_write_unchanged_text(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
+        """Test that rewriting text already on the display sends nothing."""
         lcd.write(0, 0, "Hello")
+        mock_smbus.i2c_rdwr.reset_mock()
 
-        mock_smbus.write_byte.assert_called()
+        lcd.write(0, 0, "Hello")
 
-    def test_write_exception(
-        self, mock_smbus: MagicMock, mock_sleep: MagicMock, caplog: pytest.LogCaptureFixture
-    ) -> None:
+        mock_smbus.i2c_rdwr.assert_not_called()
+
+    def test_write_only_changed_characters(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
+        """Test that only the changed run of characters is sent, starting at its own column."""
+        lcd.write(0, 1, "Timestep: 1")
+        mock_smbus.i2c_rdwr.reset_mock()
+
+        lcd.write(0, 1, "Timestep: 2")
+
+        _, payload = mock_smbus.i2c_rdwr.call_args.args[0]
+        assert payload == LCD1602._COMMAND_NIBBLES[True][0xC0 + 10] + LCD1602._DATA_NIBBLES[True][ord("2")]
+
+    def test_write_truncates_to_row(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
+        """Test that characters past the end of the row are not sent."""
+        lcd.write(14, 0, "Hello")
+
+        assert len(mock_smbus.i2c_rdwr.call_args.args[0][1]) == 4 + 2 * 4
+
+    @pytest.mark.parametrize(
+        ("old", "new", "expected"),
+        [
+            ([0x20] * 4, b"    ", []),
+            ([0x20] * 4, b"ab  ", [(0, 2)]),
+            ([0x20] * 4, b"a b ", [(0, 3)]),
+            ([0x20] * 5, b"a  b ", [(0, 1), (3, 4)]),
+        ],
+    )
+    def test_changed_runs(self, old: list[int], new: bytes, expected: list[tuple[int, int]]) -> None:
+        """Test finding the changed runs of characters."""
+        assert LCD1602._changed_runs(old, new) == expected
+
+    def test_write_exception(self, mock_smbus: MagicMock, lcd: LCD1602, caplog: pytest.LogCaptureFixture) -> None:
         """Test write method when an exception occurs during character writing."""
-        lcd = LCD1602()
+        mock_smbus.i2c_rdwr.side_effect = Exception("I2C error")
+
+        with caplog.at_level(logging.ERROR):
+            lcd.write(0, 0, "Test")
+
+        assert "Error writing text to LCD display!" in caplog.messages
+        assert not lcd._tx_buf
 
-        with patch.object(lcd, "_send_data", side_effect=Exception("I2C error")):
-            with caplog.at_level(logging.ERROR):
-                lcd.write(0, 0, "Test")
+        # The failed characters are resent on the next write
+        mock_smbus.i2c_rdwr.side_effect = None
+        lcd.write(0, 0, "Test")
+        assert len(mock_smbus.i2c_rdwr.call_args.args[0][1]) == 4 + 4 * 4
 
-        assert "Error writing text to LCD display!" in caplog.text
+    @pytest.mark.parametrize("backlight", [True, False])
+    def test_data_nibble_table(self, backlight: bool) -> None:
+        """Test that the precomputed data nibbles match the 4-bit write sequence."""
+        backlight_bit = 0x08 if backlight else 0x00
+        high = (ord("H") & 0xF0) | 0x01 | backlight_bit
+        low = ((ord("H") & 0x0F) << 4) | 0x01 | backlight_bit
 
-    def test_set_backlight(self, mock_smbus: MagicMock, mock_sleep: MagicMock) -> None:
+        assert LCD1602._DATA_NIBBLES[backlight][ord("H")] == bytes((high | 0x04, high, low | 0x04, low))
+
+    def test_set_backlight(self, mock_smbus: MagicMock) -> None:
         """Test set_backlight method."""
         lcd = LCD1602(backlight=False)
         mock_smbus.write_byte.reset_mock()
@@ -80,7 +193,19 @@ class TestLCD1602:
         assert lcd.backlight_enabled is True
         mock_smbus.write_byte.assert_called_with(lcd.address, 0x08)
 
-    def test_cleanup(self, mock_smbus: MagicMock, mock_sleep: MagicMock, caplog: pytest.LogCaptureFixture) -> None:
+    def test_set_backlight_unchanged(self, mock_smbus: MagicMock, lcd: LCD1602) -> None:
+        """Test set_backlight does not write to the bus when the state is unchanged."""
+        lcd.set_backlight(True)
+
+        mock_smbus.write_byte.assert_not_called()
+
+    def test_init_backlight_off(self, mock_smbus: MagicMock) -> None:
+        """Test that a display created with the backlight off leaves it off."""
+        lcd = LCD1602(backlight=False)
+
+        mock_smbus.write_byte.assert_called_once_with(lcd.address, 0x00)
+
+    def test_cleanup(self, mock_smbus: MagicMock, caplog: pytest.LogCaptureFixture) -> None:
         """Test cleanup method."""
         lcd = LCD1602()
 
@@ -88,16 +213,23 @@ class TestLCD1602:
             lcd.cleanup()
 
         mock_smbus.close.assert_called_once()
-        assert "LCD1602 cleanup complete." in caplog.text
-
-    def test_cleanup_exception(
-        self, mock_smbus: MagicMock, mock_sleep: MagicMock, caplog: pytest.LogCaptureFixture
+        assert "LCD1602 cleanup complete." in caplog.messages
+
+    @pytest.mark.parametrize(
+        ("method", "bus_method", "expected_log"),
+        [
+            ("clear", "i2c_rdwr", "Error clearing LCD display!"),
+            ("cleanup", "close", "Error during LCD cleanup!"),
+        ],
+    )
+    def test_method_exception(
+        self, mock_smbus: MagicMock, method: str, bus_method: str, expected_log: str, caplog: pytest.LogCaptureFixture
     ) -> None:
-        """Test cleanup method when an exception occurs."""
+        """Test that a method logs an error when the bus raises an exception."""
         lcd = LCD1602()
-        mock_smbus.close.side_effect = Exception("Cleanup error")
+        getattr(mock_smbus, bus_method).side_effect = Exception("I2C error")
 
         with caplog.at_level(logging.ERROR):
-            lcd.cleanup()
+            getattr(lcd, method)()
 
-        assert "Error during LCD cleanup!" in caplog.text
+        assert expected_log in caplog.messages
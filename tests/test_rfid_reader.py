@@ -2,20 +2,70 @@
 
 import logging
 from collections.abc import Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
+from mfrc522 import MFRC522, SimpleMFRC522
 
+from rpi_electronics_playground import base_component
 from rpi_electronics_playground.rfid_reader import RFIDReader
 
 
-@pytest.fixture
-def mock_simple_mfrc522() -> Generator[MagicMock, None, None]:
-    """Fixture to mock SimpleMFRC522."""
+@pytest.fixture(scope="module")
+def simple_mfrc522_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock SimpleMFRC522 once for every test in the module."""
+    mock_reader = MagicMock(spec=SimpleMFRC522())
+    mock_reader.configure_mock(KEY=SimpleMFRC522.KEY, BLOCK_ADDRS=SimpleMFRC522.BLOCK_ADDRS)
+    mock_reader.READER = MagicMock(spec=MFRC522())
+    # Keep the real register and constant values, so written registers compare by address
+    mock_reader.READER.configure_mock(
+        **{name: value for name, value in vars(MFRC522).items() if isinstance(value, int)}
+    )
     with patch("rpi_electronics_playground.rfid_reader.SimpleMFRC522") as mock:
-        mock_reader = MagicMock()
         mock.return_value = mock_reader
-        yield mock_reader
+        yield mock
+
+
+@pytest.fixture
+def mock_simple_mfrc522(simple_mfrc522_patch: MagicMock) -> MagicMock:
+    """Fixture to reset the shared SimpleMFRC522 mock and return its reader."""
+    simple_mfrc522_patch.reset_mock()
+    mock_reader: MagicMock = simple_mfrc522_patch.return_value
+    mock_reader.reset_mock(return_value=True, side_effect=True)
+    return mock_reader
+
+
+@pytest.fixture(scope="module")
+def gpio_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the GPIO module once for every test in the module."""
+    with patch("rpi_electronics_playground.rfid_reader.GPIO") as mock:
+        # Real modes, since resetting return values also resets the __eq__ of mock attributes
+        mock.BOARD = 10
+        mock.BCM = 11
+        yield mock
+
+
+@pytest.fixture
+def mock_gpio(gpio_patch: MagicMock) -> MagicMock:
+    """Fixture to reset the shared GPIO mock between tests."""
+    gpio_patch.reset_mock(return_value=True, side_effect=True)
+    gpio_patch.getmode.return_value = gpio_patch.BOARD  # As left by the MFRC522 library
+    return gpio_patch
+
+
+@pytest.fixture
+def mock_sleep() -> Generator[MagicMock, None, None]:
+    """Fixture to mock time.sleep."""
+    with patch("rpi_electronics_playground.rfid_reader.time.sleep") as mock:
+        yield mock
+
+
+@pytest.fixture(scope="class")
+def rfid_reader(simple_mfrc522_patch: MagicMock) -> Generator[RFIDReader, None, None]:
+    """Fixture for a reader shared by the tests in a class that only exercise the mocked SimpleMFRC522."""
+    reader = RFIDReader()
+    yield reader
+    reader.cleanup()
 
 
 class TestRFIDReader:
@@ -31,12 +81,15 @@ class TestRFIDReader:
         ],
     )
     def test_read_card(
-        self, mock_simple_mfrc522: MagicMock, card_id: int, text: str, caplog: pytest.LogCaptureFixture
+        self,
+        mock_simple_mfrc522: MagicMock,
+        rfid_reader: RFIDReader,
+        card_id: int,
+        text: str,
     ) -> None:
         """Test reading cards with various data combinations."""
         mock_simple_mfrc522.read.return_value = (card_id, text)
 
-        rfid_reader = RFIDReader()
         result = rfid_reader.read_card()
 
         assert result == (card_id, text)
@@ -52,7 +105,7 @@ class TestRFIDReader:
             result = rfid_reader.read_card()
 
         assert result is None
-        assert "Error reading card!" in caplog.text
+        assert "Error reading card!" in caplog.messages
         mock_simple_mfrc522.read.assert_called_once()
 
     @pytest.mark.parametrize(
@@ -65,10 +118,8 @@ class TestRFIDReader:
             "a" * 100,
         ],
     )
-    def test_write_card(self, mock_simple_mfrc522: MagicMock, test_text: str) -> None:
+    def test_write_card(self, mock_simple_mfrc522: MagicMock, rfid_reader: RFIDReader, test_text: str) -> None:
         """Test writing various types of text to cards."""
-        rfid_reader = RFIDReader()
-
         result = rfid_reader.write_card(test_text)
 
         mock_simple_mfrc522.write.assert_called_once_with(test_text)
@@ -85,5 +136,147 @@ class TestRFIDReader:
             result = rfid_reader.write_card(test_text)
 
         assert result is False
-        assert "Error writing to card!" in caplog.text
+        assert "Error writing to card!" in caplog.messages
         mock_simple_mfrc522.write.assert_called_once_with(test_text)
+
+    def test_read_card_blocking_polling(self, mock_simple_mfrc522: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test blocking read without an IRQ pin polls until a card is present."""
+        mock_simple_mfrc522.read_no_block.side_effect = [(None, None), (123456789, "test_data")]
+
+        rfid_reader = RFIDReader()
+        result = rfid_reader.read_card_blocking()
+
+        assert result == (123456789, "test_data")
+        assert mock_simple_mfrc522.read_no_block.call_count == 2
+        mock_sleep.assert_called_with(RFIDReader.POLL_INTERVAL)
+
+    def test_read_card_blocking_timeout(self, mock_simple_mfrc522: MagicMock) -> None:
+        """Test blocking read returns None once the timeout has elapsed."""
+        rfid_reader = RFIDReader()
+
+        result = rfid_reader.read_card_blocking(timeout=0)
+
+        assert result is None
+        mock_simple_mfrc522.read_no_block.assert_not_called()
+
+    def test_read_card_blocking_exception(
+        self, mock_simple_mfrc522: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test blocking read when an exception occurs."""
+        mock_simple_mfrc522.read_no_block.side_effect = Exception("RFID read error")
+
+        rfid_reader = RFIDReader()
+
+        with caplog.at_level(logging.ERROR):
+            result = rfid_reader.read_card_blocking()
+
+        assert result is None
+        assert "Error reading card!" in caplog.messages
+
+    def test_irq_initialization(self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock) -> None:
+        """Test that an IRQ pin enables the receive interrupt and registers an edge callback."""
+        rfid_reader = RFIDReader(irq_pin=18)
+
+        mock_simple_mfrc522.READER.Write_MFRC522.assert_called_once_with(MFRC522.CommIEnReg, RFIDReader.IRQ_ENABLE)
+        mock_gpio.add_event_detect.assert_called_once_with(18, mock_gpio.FALLING, callback=rfid_reader._on_irq)
+
+    def test_irq_initialization_sets_gpio_mode(self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock) -> None:
+        """Test that the GPIO mode is ensured before the IRQ pin is set up, as for every other component."""
+        manager = Mock()
+        with (
+            patch.object(RFIDReader, "_ensure_gpio_mode_set", manager.ensure_mode),
+            patch.object(RFIDReader, "_setup_gpio_pin", manager.setup_pin),
+        ):
+            RFIDReader(irq_pin=18)
+
+        assert [name for name, _, _ in manager.mock_calls] == ["ensure_mode", "setup_pin"]
+
+    def test_read_card_blocking_irq(self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock) -> None:
+        """Test blocking read with an IRQ pin selects the interrupting card without sending a second request."""
+        uid = [0x12, 0x34, 0x56, 0x78, 0x08]
+        mock_simple_mfrc522.READER.MFRC522_Anticoll.return_value = (MFRC522.MI_OK, uid)
+        mock_simple_mfrc522.READER.MFRC522_Auth.return_value = MFRC522.MI_OK
+        mock_simple_mfrc522.READER.MFRC522_Read.side_effect = [list(b"password123".ljust(16)), None, None]
+        mock_simple_mfrc522.uid_to_num.return_value = 987654321
+
+        rfid_reader = RFIDReader(irq_pin=18)
+        with patch.object(rfid_reader._card_event, "wait", side_effect=[False, True]) as mock_wait:
+            result = rfid_reader.read_card_blocking()
+
+        assert result == (987654321, "password123".ljust(16))
+        assert mock_wait.call_count == 2
+        mock_simple_mfrc522.read_no_block.assert_not_called()
+        mock_simple_mfrc522.READER.MFRC522_Request.assert_not_called()
+        mock_simple_mfrc522.READER.MFRC522_SelectTag.assert_called_once_with(uid)
+        mock_simple_mfrc522.READER.MFRC522_StopCrypto1.assert_called_once()
+
+    def test_read_card_blocking_irq_rearms_interrupt(
+        self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock
+    ) -> None:
+        """Test every card request re-arms the receive interrupt that the library's transceives overwrite."""
+        mock_simple_mfrc522.READER.MFRC522_Anticoll.side_effect = [
+            (MFRC522.MI_ERR, None),
+            (MFRC522.MI_OK, [0x12, 0x34, 0x56, 0x78, 0x08]),
+        ]
+        mock_simple_mfrc522.uid_to_num.return_value = 987654321
+
+        rfid_reader = RFIDReader(irq_pin=18)
+        mock_simple_mfrc522.READER.Write_MFRC522.reset_mock()
+        with patch.object(rfid_reader._card_event, "wait", return_value=True):
+            result = rfid_reader.read_card_blocking()
+
+        assert result is not None
+        assert result[0] == 987654321
+        writes = mock_simple_mfrc522.READER.Write_MFRC522.call_args_list
+        assert writes.count(call(MFRC522.CommIEnReg, RFIDReader.IRQ_ENABLE)) == 2
+        assert writes[0] == call(MFRC522.CommIEnReg, RFIDReader.IRQ_ENABLE)
+
+    def test_cleanup_releases_reset_pin(
+        self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cleanup releases the reset pin set up by the MFRC522 library, and no other pins."""
+        mock_cleanup = MagicMock()
+        monkeypatch.setattr(base_component.GPIO, "cleanup", mock_cleanup)
+
+        rfid_reader = RFIDReader()
+        rfid_reader.cleanup()
+
+        mock_cleanup.assert_called_once_with([RFIDReader.RST_PIN_BOARD])
+        mock_simple_mfrc522.READER.spi.close.assert_called_once()
+        mock_simple_mfrc522.READER.Close_MFRC522.assert_not_called()
+
+    def test_on_irq_sets_event(self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock) -> None:
+        """Test that the IRQ callback wakes any blocked reader."""
+        rfid_reader = RFIDReader(irq_pin=18)
+
+        rfid_reader._on_irq(18)
+
+        assert rfid_reader._card_event.is_set()
+
+    def test_cleanup_irq(
+        self, mock_simple_mfrc522: MagicMock, mock_gpio: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cleanup removes the IRQ edge detection and closes SPI without a global GPIO cleanup."""
+        gpio_mode: list[str | None] = [base_component.GPIO.BCM]
+
+        def gpio_cleanup(channels: list[int] | None = None) -> None:
+            # Like RPi.GPIO, releasing channels needs the mode, and a global cleanup resets it
+            if channels is None:
+                gpio_mode[0] = None
+            elif gpio_mode[0] is None:
+                msg = "Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) or GPIO.setmode(GPIO.BCM)"
+                raise RuntimeError(msg)
+
+        mock_cleanup = MagicMock(side_effect=gpio_cleanup)
+        monkeypatch.setattr(base_component.GPIO, "cleanup", mock_cleanup)
+        monkeypatch.setattr(base_component.GPIO, "getmode", lambda: gpio_mode[0])
+        mock_simple_mfrc522.READER.Close_MFRC522.side_effect = gpio_cleanup
+
+        rfid_reader = RFIDReader(irq_pin=18)
+        rfid_reader.cleanup()
+
+        mock_gpio.remove_event_detect.assert_called_once_with(18)
+        mock_simple_mfrc522.READER.spi.close.assert_called_once()
+        mock_simple_mfrc522.READER.Close_MFRC522.assert_not_called()
+        mock_cleanup.assert_called_once_with([RFIDReader.RST_PIN_BOARD, 18])
+        assert gpio_mode[0] == base_component.GPIO.BCM
@@ -1,23 +1,69 @@
 """Unit tests for the rpi_electronics_playground.servo_motor module."""
 
+import asyncio
 from collections.abc import Generator
-from unittest.mock import MagicMock, patch
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 from rpi_electronics_playground.servo_motor import ServoMotor
 
+# Methods of an RPi.GPIO software PWM channel, so the PWM fake can be a plain spec'd Mock rather than a MagicMock
+PWM_METHODS = ["ChangeDutyCycle", "ChangeFrequency", "start", "stop"]
 
-@pytest.fixture
-def mock_gpio() -> Generator[MagicMock, None, None]:
-    """Fixture to mock GPIO module."""
+# (value, in_min, in_max, out_min, out_max, expected) cases for ServoMotor._map_value
+MAP_VALUE_CASES = (
+    # Basic mapping - 50% of input range should map to 50% of output range
+    (50, 0, 100, 0, 180, 90),
+    # Edge case - minimum input should map to minimum output
+    (0, 0, 100, 0, 180, 0),
+    # Edge case - maximum input should map to maximum output
+    (100, 0, 100, 0, 180, 180),
+    # Different ranges - test with pulse width mapping
+    (1500, 500, 2500, 0, 100, 50),
+)
+
+
+@pytest.fixture(scope="module")
+def gpio_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the GPIO module once for every test in the module."""
     with patch("rpi_electronics_playground.servo_motor.GPIO") as mock:
-        mock.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock.PWM.return_value = mock_pwm
         yield mock
 
 
+@pytest.fixture
+def mock_gpio(gpio_patch: MagicMock) -> MagicMock:
+    """Fixture to reset the shared GPIO mock between tests."""
+    gpio_patch.reset_mock(return_value=True, side_effect=True)
+    gpio_patch.PWM.return_value = Mock(spec=PWM_METHODS)
+    return gpio_patch
+
+
+@pytest.fixture(scope="module")
+def shared_servo(gpio_patch: MagicMock) -> Generator[ServoMotor, None, None]:
+    """Fixture for a servo built once for the tests that only drive its lock state."""
+    gpio_patch.PWM.return_value = Mock(spec=PWM_METHODS)
+    servo = ServoMotor()
+    yield servo
+    servo.cleanup()
+
+
+@pytest.fixture
+def servo(shared_servo: ServoMotor, mock_gpio: MagicMock) -> ServoMotor:
+    """Fixture to return the shared servo to its locked position with a fresh PWM call history."""
+    shared_servo.is_locked = True
+    shared_servo._current_angle = shared_servo.locked_angle
+    cast("Mock", shared_servo.pwm).reset_mock()
+    return shared_servo
+
+
+@pytest.fixture
+def mock_pwm(servo: ServoMotor) -> Mock:
+    """Fixture for the software PWM mock driven by the shared servo."""
+    return cast("Mock", servo.pwm)
+
+
 @pytest.fixture
 def mock_sleep() -> Generator[MagicMock, None, None]:
     """Fixture to mock time.sleep."""
@@ -25,22 +71,25 @@ def mock_sleep() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def mock_async_sleep() -> Generator[AsyncMock, None, None]:
+    """Fixture to mock asyncio.sleep."""
+    with patch("rpi_electronics_playground.servo_motor.asyncio.sleep", new_callable=AsyncMock) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_pigpio() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the optional pigpio module."""
+    with patch("rpi_electronics_playground.servo_motor.pigpio") as mock:
+        mock.pi.return_value.connected = True
+        yield mock
+
+
 class TestServoMotor:
     """Unit tests for the ServoMotor class."""
 
-    @pytest.mark.parametrize(
-        ("value", "in_min", "in_max", "out_min", "out_max", "expected"),
-        [
-            # Basic mapping - 50% of input range should map to 50% of output range
-            (50, 0, 100, 0, 180, 90),
-            # Edge case - minimum input should map to minimum output
-            (0, 0, 100, 0, 180, 0),
-            # Edge case - maximum input should map to maximum output
-            (100, 0, 100, 0, 180, 180),
-            # Different ranges - test with pulse width mapping
-            (1500, 500, 2500, 0, 100, 50),
-        ],
-    )
+    @pytest.mark.parametrize(("value", "in_min", "in_max", "out_min", "out_max", "expected"), MAP_VALUE_CASES)
     def test_map_value(
         self,
         value: int,
@@ -53,122 +102,175 @@ class TestServoMotor:
         """Test the _map_value static method with various input combinations."""
         assert ServoMotor._map_value(value, in_min, in_max, out_min, out_max) == expected
 
+    @pytest.mark.parametrize(("min_pulse", "max_pulse"), [(500, 2500), (1000, 2000), (544, 2400)])
+    def test_angle_to_duty_cycle(self, min_pulse: int, max_pulse: int, mock_gpio: MagicMock) -> None:
+        """Test the fused integer mapping matches mapping via the pulse width for every angle."""
+        servo = ServoMotor(min_pulse=min_pulse, max_pulse=max_pulse)
+
+        for angle in range(181):
+            pulse_width = ServoMotor._map_value(angle, 0, 180, min_pulse, max_pulse)
+            assert servo._angle_to_duty_cycle(angle) == ServoMotor._map_value(pulse_width, 0, 20000, 0, 100)
+
+    @pytest.mark.parametrize(("angle", "expected"), [(-10, 0), (0, 0), (90, 90), (180, 180), (200, 180)])
+    def test_clamp_angle(self, angle: int, expected: int) -> None:
+        """Test that angles outside 0-180 degrees are clamped."""
+        assert ServoMotor._clamp_angle(angle) == expected
+
+    def test_set_angle_clamped(self, mock_sleep: MagicMock, mock_gpio: MagicMock) -> None:
+        """Test that setting an angle beyond the servo's travel moves it to the end of travel."""
+        servo = ServoMotor(locked_angle=-10, unlocked_angle=200)
+        servo._set_angle(270)
+
+        assert servo.locked_angle == 0
+        assert servo.unlocked_angle == ServoMotor.MAX_ANGLE
+        mock_gpio.PWM.return_value.ChangeDutyCycle.assert_called_with(servo._angle_to_duty_cycle(ServoMotor.MAX_ANGLE))
+        mock_sleep.assert_called_with(ServoMotor.FULL_SWEEP_SETTLE_TIME)
+
     def test_set_angle(self, mock_sleep: MagicMock, mock_gpio: MagicMock) -> None:
         """Test setting servo angle."""
-        mock_gpio.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock_gpio.PWM.return_value = mock_pwm
-
+        mock_pwm = mock_gpio.PWM.return_value
         servo = ServoMotor()
         servo._set_angle(90)
 
         mock_pwm.ChangeDutyCycle.assert_called()
-        mock_sleep.assert_called_with(0.5)
+        mock_sleep.assert_called_with(0.25)  # Half of a full sweep
 
     @pytest.mark.parametrize(
-        ("initial_locked_state", "expected_locked_state", "should_call_pwm"),
+        ("start_angle", "target_angle", "expected_settle"),
         [
-            # Test locking when unlocked - should change state and call PWM
-            (False, True, True),
-            # Test locking when already locked - should not change state or call PWM
-            (True, True, False),
+            (0, 180, 0.5),
+            (180, 0, 0.5),
+            (0, 45, 0.125),
+            (90, 92, 0.05),  # Small moves still wait the minimum settle time
         ],
     )
-    def test_lock(
+    def test_settle_time_scales_with_travel(
         self,
-        initial_locked_state: bool,
-        expected_locked_state: bool,
-        should_call_pwm: bool,
+        start_angle: int,
+        target_angle: int,
+        expected_settle: float,
         mock_sleep: MagicMock,
         mock_gpio: MagicMock,
     ) -> None:
-        """Test locking mechanism with different initial states."""
-        mock_gpio.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock_gpio.PWM.return_value = mock_pwm
+        """Test that the settle time is proportional to the distance moved."""
+        servo = ServoMotor(locked_angle=start_angle)
 
-        servo = ServoMotor()
-        servo.is_locked = initial_locked_state
-        initial_call_count = mock_pwm.ChangeDutyCycle.call_count
+        servo._set_angle(target_angle)
 
-        servo._lock()
+        mock_sleep.assert_called_once_with(pytest.approx(expected_settle))
+        assert servo._current_angle == target_angle
 
-        assert servo.is_locked == expected_locked_state
-        if should_call_pwm:
-            assert mock_pwm.ChangeDutyCycle.call_count > initial_call_count
-        else:
-            assert mock_pwm.ChangeDutyCycle.call_count == initial_call_count
+    def test_lock_state_transitions(self, servo: ServoMotor, mock_pwm: Mock) -> None:
+        """Test lock, unlock and toggle from each initial state against one servo."""
+        cases = [
+            # (method, initial_locked_state, expected_locked_state, should_call_pwm)
+            ("_lock", False, True, True),  # Locking when unlocked moves the servo
+            ("_lock", True, True, False),  # Locking when already locked does nothing
+            ("_unlock", True, False, True),  # Unlocking when locked moves the servo
+            ("_unlock", False, False, False),  # Unlocking when already unlocked does nothing
+            ("toggle", True, False, True),
+            ("toggle", False, True, True),
+        ]
 
-    @pytest.mark.parametrize(
-        ("initial_locked_state", "expected_locked_state", "should_call_pwm"),
-        [
-            # Test unlocking when locked - should change state and call PWM
-            (True, False, True),
-            # Test unlocking when already unlocked - should not change state or call PWM
-            (False, False, False),
-        ],
-    )
-    def test_unlock(
+        for method, initial_locked_state, expected_locked_state, should_call_pwm in cases:
+            servo.is_locked = initial_locked_state
+            mock_pwm.ChangeDutyCycle.reset_mock()
+
+            getattr(servo, method)()
+
+            assert servo.is_locked == expected_locked_state, method
+            assert mock_pwm.ChangeDutyCycle.called is should_call_pwm, method
+
+    @pytest.mark.parametrize("initial_locked_state", [True, False])
+    def test_toggle_async(
         self,
         initial_locked_state: bool,
-        expected_locked_state: bool,
-        should_call_pwm: bool,
+        mock_async_sleep: AsyncMock,
         mock_sleep: MagicMock,
-        mock_gpio: MagicMock,
+        servo: ServoMotor,
+        mock_pwm: Mock,
     ) -> None:
-        """Test unlocking mechanism with different initial states."""
-        mock_gpio.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock_gpio.PWM.return_value = mock_pwm
+        """Test asynchronous toggle from different initial states."""
+        servo.is_locked = initial_locked_state
+        expected_duty = servo._unlocked_duty if initial_locked_state else servo._locked_duty
+
+        asyncio.run(servo.toggle_async())
+
+        assert servo.is_locked is not initial_locked_state
+        mock_pwm.ChangeDutyCycle.assert_called_with(expected_duty)
+        mock_async_sleep.assert_awaited_once()
+        mock_sleep.assert_not_called()
 
+    def test_no_instance_dict(self, mock_gpio: MagicMock) -> None:
+        """Test that all instance attributes are stored in slots."""
+        assert not hasattr(ServoMotor(), "__dict__")
+
+    def test_cleanup(self, mock_gpio: MagicMock) -> None:
+        """Test cleanup method."""
+        mock_pwm = mock_gpio.PWM.return_value
         servo = ServoMotor()
-        servo.is_locked = initial_locked_state
-        initial_call_count = mock_pwm.ChangeDutyCycle.call_count
+        servo.cleanup()
+
+        mock_pwm.stop.assert_called_once()
+        assert servo.pwm is None
+
+
+class TestServoMotorHardwarePWM:
+    """Unit tests for ServoMotor driven by pigpio hardware PWM."""
+
+    def test_initialization_uses_hardware_pwm(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that hardware PWM replaces software PWM on a PWM-capable pin."""
+        servo = ServoMotor(pin=18)
 
-        servo._unlock()
+        mock_pigpio.pi.return_value.hardware_PWM.assert_called_once_with(18, 50, 0)
+        mock_gpio.PWM.assert_not_called()
+        assert servo.pwm is None
+
+    def test_initialization_software_pwm_pin(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that software PWM is used on pins without a hardware PWM channel."""
+        servo = ServoMotor(pin=17)
+
+        mock_pigpio.pi.assert_not_called()
+        mock_gpio.PWM.assert_called_once_with(17, 50)
+        assert servo._pi is None
+
+    def test_initialization_without_daemon(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that software PWM is used when the pigpio daemon is not running."""
+        mock_pigpio.pi.return_value.connected = False
+
+        servo = ServoMotor()
 
-        assert servo.is_locked == expected_locked_state
-        if should_call_pwm:
-            assert mock_pwm.ChangeDutyCycle.call_count > initial_call_count
-        else:
-            assert mock_pwm.ChangeDutyCycle.call_count == initial_call_count
+        mock_pigpio.pi.return_value.stop.assert_called_once()
+        mock_gpio.PWM.assert_called_once_with(18, 50)
+        assert servo._pi is None
 
     @pytest.mark.parametrize(
-        ("initial_locked_state", "expected_locked_state"),
+        ("angle", "duty_cycle_ppm"),
         [
-            # Test toggle from locked - should change to unlocked
-            (True, False),
-            # Test toggle from unlocked - should change to locked
-            (False, True),
+            (0, 25_000),
+            (90, 75_000),
+            (91, 75_550),
+            (180, 125_000),
         ],
     )
-    def test_toggle(
-        self,
-        initial_locked_state: bool,
-        expected_locked_state: bool,
-        mock_sleep: MagicMock,
-        mock_gpio: MagicMock,
+    def test_set_angle(
+        self, mock_sleep: MagicMock, mock_gpio: MagicMock, mock_pigpio: MagicMock, angle: int, duty_cycle_ppm: int
     ) -> None:
-        """Test toggle functionality from different initial states."""
-        mock_gpio.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock_gpio.PWM.return_value = mock_pwm
+        """Test that the pulse width is sent to the hardware PWM as a duty cycle in parts per million."""
+        servo = ServoMotor(locked_angle=45)
 
-        servo = ServoMotor()
-        servo.is_locked = initial_locked_state
-
-        servo.toggle()
+        servo._set_angle(angle)
 
-        assert servo.is_locked == expected_locked_state
-
-    def test_cleanup(self, mock_gpio: MagicMock) -> None:
-        """Test cleanup method."""
-        mock_gpio.getmode.return_value = None
-        mock_pwm = MagicMock()
-        mock_gpio.PWM.return_value = mock_pwm
+        mock_pigpio.pi.return_value.hardware_PWM.assert_called_with(18, 50, duty_cycle_ppm)
+        mock_sleep.assert_called_once()
 
+    def test_cleanup(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that cleanup stops the hardware PWM and disconnects from the daemon."""
         servo = ServoMotor()
+        mock_pi = mock_pigpio.pi.return_value
+
         servo.cleanup()
 
-        mock_pwm.stop.assert_called_once()
-        assert servo.pwm is None
+        mock_pi.hardware_PWM.assert_called_with(18, 0, 0)
+        mock_pi.stop.assert_called_once()
+        assert servo._pi is None
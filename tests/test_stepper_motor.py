@@ -6,84 +6,172 @@ from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from rpi_electronics_playground.stepper_motor import StepperMotor
+from rpi_electronics_playground.stepper_motor import _CCW_PHASES, _CW_PHASES, StepperMotor
 
+# A coarse motor keeps the step count, and so the number of mocked GPIO calls, small in rotation tests
+COARSE_STEPS_PER_REVOLUTION = 8
+QUARTER_TURN_STEPS = int((90 / 360) * COARSE_STEPS_PER_REVOLUTION)  # 8/4 = 2 steps
+OUTPUT_CALLS_PER_STEP = 4  # One call per phase, writing all pins together
 
-@pytest.fixture
-def mock_gpio() -> Generator[MagicMock, None, None]:
-    """Fixture to mock GPIO module."""
+
+@pytest.fixture(scope="module")
+def gpio_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the GPIO module once for every test in the module."""
     with patch("rpi_electronics_playground.stepper_motor.GPIO") as mock:
         yield mock
 
 
+@pytest.fixture
+def mock_gpio(gpio_patch: MagicMock) -> MagicMock:
+    """Fixture to reset the shared GPIO mock between tests."""
+    gpio_patch.reset_mock(return_value=True, side_effect=True)
+    return gpio_patch
+
+
+@pytest.fixture(autouse=True)
+def mock_perf_counter() -> Generator[MagicMock, None, None]:
+    """Fixture to mock time.perf_counter with a clock that advances 50us on each read."""
+    clock = [0.0]
+
+    def tick() -> float:
+        clock[0] += 0.00005
+        return clock[0]
+
+    with patch("rpi_electronics_playground.stepper_motor.time.perf_counter", side_effect=tick) as mock:
+        mock.clock = clock
+        yield mock
+
+
 @pytest.fixture(autouse=True)
-def mock_sleep() -> Generator[MagicMock, None, None]:
-    """Fixture to mock time.sleep."""
-    with patch("rpi_electronics_playground.stepper_motor.time.sleep") as mock:
+def mock_sleep(mock_perf_counter: MagicMock) -> Generator[MagicMock, None, None]:
+    """Fixture to mock time.sleep, advancing the mocked clock by the requested duration."""
+
+    def advance(seconds: float) -> None:
+        mock_perf_counter.clock[0] += seconds
+
+    with patch("rpi_electronics_playground.stepper_motor.time.sleep", side_effect=advance) as mock:
         yield mock
 
 
 class TestStepperMotor:
     """Unit tests for StepperMotor core functionality."""
 
+    def test_phase_tables(self) -> None:
+        """Test the precomputed coil states match the 28BYJ-48 full-step sequence."""
+        assert _CW_PHASES == ((1, 0, 0, 1), (1, 1, 0, 0), (0, 1, 1, 0), (0, 0, 1, 1))
+        assert _CCW_PHASES == ((1, 0, 0, 1), (0, 0, 1, 1), (0, 1, 1, 0), (1, 1, 0, 0))
+
+    def test_step_clockwise(self, mock_gpio: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test that one clockwise step drives all pins together through the phase sequence."""
+        motor = StepperMotor()
+        mock_gpio.output.reset_mock()
+
+        motor._step_clockwise()
+
+        expected_calls = [call(motor._pin_list, phase) for phase in _CW_PHASES]
+        assert mock_gpio.output.call_args_list == expected_calls
+        assert mock_sleep.call_count == 4
+
+    def test_wait_until_sleeps_then_spins(self, mock_perf_counter: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test that waiting sleeps short of the deadline and spins the rest of the way."""
+        motor = StepperMotor()
+        mock_perf_counter.clock[0] = 0.0
+
+        motor._wait_until(0.002)
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.002 - 0.00005 - StepperMotor.SPIN_THRESHOLD))
+        assert mock_perf_counter.clock[0] >= 0.002
+
+    def test_wait_until_only_spins_near_deadline(self, mock_perf_counter: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test that no sleep is issued when the deadline is within the spin threshold."""
+        motor = StepperMotor()
+        mock_perf_counter.clock[0] = 0.0
+
+        motor._wait_until(0.0002)
+
+        mock_sleep.assert_not_called()
+        assert mock_perf_counter.clock[0] >= 0.0002
+
+    def test_step_does_not_accumulate_drift(self, mock_perf_counter: MagicMock) -> None:
+        """Test that phase deadlines are scheduled from the step start rather than from each wake-up."""
+        motor = StepperMotor()
+        mock_perf_counter.clock[0] = 0.0
+
+        motor._step_clockwise()
+
+        assert mock_perf_counter.clock[0] < 4 * motor.step_speed + 0.0001
+
+    def test_rotate_does_not_accumulate_drift(self, mock_perf_counter: MagicMock) -> None:
+        """Test that a multi-step rotation keeps one continuous deadline across steps."""
+        motor = StepperMotor()
+        mock_perf_counter.clock[0] = 0.0
+
+        motor.rotate_clockwise(10)
+
+        assert mock_perf_counter.clock[0] < 10 * 4 * motor.step_speed + 0.0001
+
+    def test_rotate_realtime(self, mock_gpio: MagicMock) -> None:
+        """Test that rotation runs inside the real-time section when enabled."""
+        motor = StepperMotor(realtime=True)
+
+        with patch.object(StepperMotor, "_realtime_section") as mock_section:
+            motor.rotate_clockwise(1)
+
+        mock_section.assert_called_once()
+        assert motor.realtime
+
+    def test_no_instance_dict(self, mock_gpio: MagicMock) -> None:
+        """Test that all instance attributes are stored in slots."""
+        assert not hasattr(StepperMotor(), "__dict__")
+
     def test_rotate_clockwise(self, mock_gpio: MagicMock, mock_sleep: MagicMock) -> None:
         """Test clockwise rotation."""
-        mock_gpio.getmode.return_value = None
         motor = StepperMotor()
         motor.rotate_clockwise(5)
 
         # Verify that GPIO.output was called for the stepping sequence
-        assert mock_gpio.output.call_count >= 5 * 4 * 4  # 5 steps * 4 phases * 4 pins per phase
+        assert mock_gpio.output.call_count >= 5 * 4  # 5 steps * 4 phases, all pins per call
         mock_sleep.assert_called()
 
     def test_rotate_counterclockwise(self, mock_gpio: MagicMock, mock_sleep: MagicMock) -> None:
         """Test counterclockwise rotation."""
-        mock_gpio.getmode.return_value = None
         motor = StepperMotor()
         motor.rotate_counterclockwise(3)
 
         # Verify that GPIO.output was called for the stepping sequence
-        assert mock_gpio.output.call_count >= 3 * 4 * 4  # 3 steps * 4 phases * 4 pins per phase
+        assert mock_gpio.output.call_count >= 3 * 4  # 3 steps * 4 phases, all pins per call
         mock_sleep.assert_called()
 
     def test_rotate_degrees_clockwise(self, mock_gpio: MagicMock, mock_sleep: MagicMock) -> None:
         """Test degree-based clockwise rotation."""
-        mock_gpio.getmode.return_value = None
-        motor = StepperMotor()
+        motor = StepperMotor(steps_per_revolution=COARSE_STEPS_PER_REVOLUTION)
         motor.rotate_degrees_clockwise(90)
 
-        # 90 degrees = 1/4 revolution = 2048/4 = 512 steps
-        expected_steps = int((90 / 360) * 2048)
-        assert mock_gpio.output.call_count >= expected_steps * 4 * 4
+        assert mock_gpio.output.call_count >= QUARTER_TURN_STEPS * OUTPUT_CALLS_PER_STEP
 
     def test_rotate_degrees_counterclockwise(self, mock_gpio: MagicMock, mock_sleep: MagicMock) -> None:
         """Test degree-based counterclockwise rotation."""
-        mock_gpio.getmode.return_value = None
-        motor = StepperMotor()
+        motor = StepperMotor(steps_per_revolution=COARSE_STEPS_PER_REVOLUTION)
         motor.rotate_degrees_counterclockwise(90)
 
-        # 90 degrees = 1/4 revolution = 2048/4 = 512 steps
-        expected_steps = int((90 / 360) * 2048)
-        assert mock_gpio.output.call_count >= expected_steps * 4 * 4
+        assert mock_gpio.output.call_count >= QUARTER_TURN_STEPS * OUTPUT_CALLS_PER_STEP
 
     def test_stop(self, mock_gpio: MagicMock) -> None:
         """Test motor stop functionality."""
-        mock_gpio.getmode.return_value = None
         motor = StepperMotor()
-        mock_gpio.output.reset_mock()  # Reset call count from initialization
+        calls_before = len(mock_gpio.output.call_args_list)  # Skip the calls from initialization
 
         motor.stop()
 
-        # Verify all pins are set to LOW
+        # Verify all pins are set to LOW, and nothing else is written
         expected_calls = [call(pin, mock_gpio.LOW) for pin in motor.motor_pins]
-        mock_gpio.output.assert_has_calls(expected_calls)
+        assert mock_gpio.output.call_args_list[calls_before:] == expected_calls
 
     def test_cleanup(self, mock_gpio: MagicMock, caplog: pytest.LogCaptureFixture) -> None:
         """Test motor cleanup."""
-        mock_gpio.getmode.return_value = None
+        caplog.set_level(logging.INFO)
         motor = StepperMotor()
 
-        with caplog.at_level(logging.INFO):
-            motor.cleanup()
+        motor.cleanup()
 
-        assert "cleanup complete" in caplog.text
+        assert "StepperMotor cleanup complete" in caplog.messages
@@ -1,21 +1,50 @@
 """Unit tests for the rpi_electronics_playground.ultrasonic_sensor module."""
 
+import itertools
 import logging
+import statistics
+import threading
 from collections.abc import Generator
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from rpi_electronics_playground.ultrasonic_sensor import UltrasonicSensor
+from rpi_electronics_playground.ultrasonic_sensor import UltrasonicSensor, _median, _median3, _median5
 
 
-@pytest.fixture
-def mock_gpio() -> Generator[MagicMock, None, None]:
-    """Fixture to mock GPIO module."""
+@pytest.fixture(scope="module")
+def gpio_patch() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the GPIO module once for every test in the module."""
     with patch("rpi_electronics_playground.ultrasonic_sensor.GPIO") as mock:
+        # Real levels, since resetting return values also resets the __eq__ of mock attributes
+        mock.HIGH = 1
+        mock.LOW = 0
         yield mock
 
 
+@pytest.fixture
+def mock_gpio(gpio_patch: MagicMock) -> MagicMock:
+    """Fixture to reset the shared GPIO mock between tests."""
+    gpio_patch.reset_mock(return_value=True, side_effect=True)
+    return gpio_patch
+
+
+@pytest.fixture(scope="module")
+def shared_sensor(gpio_patch: MagicMock) -> Generator[UltrasonicSensor, None, None]:
+    """Fixture for a sensor with the default settings, built once for the tests that do not customize it."""
+    sensor = UltrasonicSensor()
+    yield sensor
+    sensor.cleanup()
+
+
+@pytest.fixture
+def sensor(shared_sensor: UltrasonicSensor, mock_gpio: MagicMock) -> UltrasonicSensor:
+    """Fixture to clear the filter state of the shared sensor between tests."""
+    shared_sensor.readings_buffer.clear()
+    shared_sensor.last_stable_reading = None
+    return shared_sensor
+
+
 @pytest.fixture
 def mock_time() -> Generator[MagicMock, None, None]:
     """Fixture to mock time module."""
@@ -23,85 +52,178 @@ def mock_time() -> Generator[MagicMock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def mock_pigpio() -> Generator[MagicMock, None, None]:
+    """Fixture to mock the optional pigpio module."""
+    with patch("rpi_electronics_playground.ultrasonic_sensor.pigpio") as mock:
+        mock.pi.return_value.connected = True
+        mock.tickDiff.side_effect = lambda start, end: end - start
+        yield mock
+
+
+class TestMedian:
+    """Unit tests for the _median helper."""
+
+    @pytest.mark.parametrize(
+        ("values", "expected"),
+        [
+            ([25.0], 25.0),
+            ([26.0, 24.0], 25.0),
+            ([25.5, 24.0, 30.0], 25.5),
+            ([3.0, 1.0, 4.0, 2.0], 2.5),
+            ([24.0, 26.0, 25.0, 23.0, 27.0], 25.0),
+        ],
+    )
+    def test_median(self, values: list[float], expected: float) -> None:
+        """Test the median of odd and even length lists."""
+        assert _median(values) == expected
+
+    def test_median3_network(self) -> None:
+        """Test the three-reading network against every ordering, including ties."""
+        for values in itertools.product(range(3), repeat=3):
+            assert _median3(*values) == statistics.median(values)
+
+    def test_median5_network(self) -> None:
+        """Test the five-reading network against every ordering, including ties."""
+        for values in itertools.product(range(4), repeat=5):
+            assert _median5(*values) == statistics.median(values)
+
+
 class TestUltrasonicSensor:
     """Unit tests for UltrasonicSensor core functionality."""
 
-    def test_single_distance_measurement(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+    def test_single_distance_measurement(
+        self, mock_gpio: MagicMock, mock_time: MagicMock, sensor: UltrasonicSensor
+    ) -> None:
         """Test single distance measurement with successful reading."""
-        mock_gpio.getmode.return_value = None
+        low, high = mock_gpio.LOW, mock_gpio.HIGH
 
         # Mock GPIO input sequence for echo response
         mock_gpio.input.side_effect = [
-            mock_gpio.LOW,  # First check in wait-for-HIGH loop
-            mock_gpio.HIGH,  # Echo goes HIGH (exits first loop)
-            mock_gpio.HIGH,  # First check in wait-for-LOW loop
-            mock_gpio.LOW,  # Echo goes LOW (exits second loop)
+            low,  # Echo not started yet
+            high,  # Echo goes HIGH (rising edge)
+            high,  # Echo still HIGH
+            low,  # Echo goes LOW (falling edge, exits loop)
         ]
 
-        # Mock time.time() calls:
-        # 1. Initial timeout_start time
-        # 2. pulse_start time (when echo goes HIGH)
-        # 3. Initial timeout_end time
-        # 4. pulse_end time (when echo goes LOW)
-        # Pulse duration: 1.0001 - 1.0 = 0.0001 seconds = 1.715 cm distance
-        mock_time.time.side_effect = [1.0, 1.0, 1.0, 1.0001]
+        # Mock time.monotonic_ns() calls:
+        # 1-2. Trigger pulse start and end of the 10us busy-wait
+        # 3. Deadline for the echo
+        # 4-7. One timestamp per echo poll: LOW, HIGH (rising edge), HIGH, LOW (falling edge)
+        # Pulse duration: 100,000ns = 0.0001 seconds = 1.715 cm distance
+        mock_time.monotonic_ns.side_effect = [0, 10_000] + [1_000_000_000] * 4 + [1_000_100_000]
         mock_time.sleep = MagicMock()  # Mock sleep calls
 
-        sensor = UltrasonicSensor()
         distance = sensor._get_single_distance()
 
-        # Expected: (0.0001 * 34300) / 2 = 1.715, rounded to 1.71
-        assert distance == 1.71
+        # Expected: (100,000ns * 34300) / 2 / 1e9 = 1.715, rounded half up to 1.72
+        assert distance == 1.72
 
         # Verify trigger pulse sequence
         expected_calls = [
-            call(5, mock_gpio.LOW),  # Initialization (from _setup_gpio_pin)
-            call(5, mock_gpio.HIGH),  # Trigger pulse
-            call(5, mock_gpio.LOW),  # Trigger end
+            call(5, low),  # Trigger settle
+            call(5, high),  # Trigger pulse
+            call(5, low),  # Trigger end
         ]
         mock_gpio.output.assert_has_calls(expected_calls)
+        mock_time.sleep.assert_not_called()
 
-    def test_single_distance_timeout(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+    def test_single_distance_timeout(
+        self, mock_gpio: MagicMock, mock_time: MagicMock, sensor: UltrasonicSensor
+    ) -> None:
         """Test single distance measurement with timeout."""
-        mock_gpio.getmode.return_value = None
-
         # Simulate timeout condition
         mock_gpio.input.return_value = mock_gpio.LOW
-        mock_time.time.side_effect = [1.0, 1.6]  # Timeout after 0.6 seconds
+        mock_time.monotonic_ns.side_effect = [0, 10_000, 1_000_000_000, 1_050_000_000]  # No echo for 50ms
 
-        sensor = UltrasonicSensor()
         distance = sensor._get_single_distance()
 
         assert distance == -1.0
 
-    def test_outlier_detection(self, mock_gpio: MagicMock) -> None:
-        """Test outlier detection logic."""
-        mock_gpio.getmode.return_value = None
+    def test_single_distance_echo_already_high(
+        self, mock_gpio: MagicMock, mock_time: MagicMock, sensor: UltrasonicSensor
+    ) -> None:
+        """Test that an echo already HIGH on the first poll is timed from that poll."""
+        mock_gpio.input.side_effect = [mock_gpio.HIGH, mock_gpio.LOW]
+        mock_time.monotonic_ns.side_effect = [0, 10_000, 1_000_000_000, 1_000_000_000, 1_000_200_000]
+
+        distance = sensor._get_single_distance()
+
+        assert distance == 3.43
+
+    def test_single_distance_echo_stuck_high(
+        self, mock_gpio: MagicMock, mock_time: MagicMock, sensor: UltrasonicSensor
+    ) -> None:
+        """Test single distance measurement times out when the echo never ends."""
+        mock_gpio.input.return_value = mock_gpio.HIGH
+        # Echo HIGH for 50ms
+        mock_time.monotonic_ns.side_effect = [0, 10_000, 1_000_000_000, 1_000_000_000, 1_050_000_000]
+
+        distance = sensor._get_single_distance()
+
+        assert distance == -1.0
+
+    def test_single_distance_follows_echo_timeout(
+        self, mock_gpio: MagicMock, mock_time: MagicMock, sensor: UltrasonicSensor
+    ) -> None:
+        """Test that the polled echo timeout is derived from ECHO_TIMEOUT."""
+        mock_gpio.input.side_effect = [mock_gpio.HIGH, mock_gpio.LOW]
+        # Echo HIGH for 50ms, within a 0.1 second timeout
+        mock_time.monotonic_ns.side_effect = [0, 10_000, 1_000_000_000, 1_000_000_000, 1_050_000_000]
+
+        with patch.object(UltrasonicSensor, "ECHO_TIMEOUT", 0.1):
+            distance = sensor._get_single_distance()
+
+        assert distance == 857.5
+
+    @pytest.mark.parametrize(
+        ("readings", "expected"),
+        [
+            # Too few readings for quartiles, kept as-is
+            ([25.0, 80.0, 24.0], [25.0, 80.0, 24.0]),
+            # A single far reading is rejected
+            ([25.0, 26.0, 80.0, 24.0, 25.5], [24.0, 25.0, 25.5, 26.0]),
+            # A tight cluster still keeps readings within the minimum fence
+            ([25.0, 25.0, 25.0, 27.0], [25.0, 25.0, 25.0, 27.0]),
+            # A single near reading is rejected as well as far ones
+            ([40.0, 41.0, 40.5, 25.0, 40.2], [40.0, 40.2, 40.5, 41.0]),
+        ],
+    )
+    def test_reject_outliers(self, readings: list[float], expected: list[float], mock_gpio: MagicMock) -> None:
+        """Test interquartile outlier rejection over a batch of readings."""
         sensor = UltrasonicSensor(outlier_threshold=3.0)
 
-        # No reference reading yet
-        assert not sensor._is_outlier(25.0)
+        assert sensor._reject_outliers(readings) == expected
+
+    def test_get_distance_rejects_outliers(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+        """Test that outliers in the batch are dropped before taking the median."""
+        sensor = UltrasonicSensor(sample_count=4, outlier_threshold=3.0)
 
-        # Set reference and test within threshold
-        sensor.last_stable_reading = 25.0
-        sensor.readings_buffer.extend([24.0, 25.0, 26.0])  # Buffer size >= 3
-        assert not sensor._is_outlier(27.0)  # Within 3.0 cm
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
+            mock_single.side_effect = [25.0, 26.0, 80.0, 24.0]
 
-        # Test exceeding threshold
-        assert sensor._is_outlier(30.0)  # Exceeds 3.0 cm
+            sensor.get_distance()
 
-        # Test adaptive threshold with small buffer
-        sensor.readings_buffer.clear()
-        sensor.readings_buffer.extend([24.0, 25.0])  # Buffer size < 3
-        # Should use adaptive threshold (3.0 * 2 = 6.0)
-        assert not sensor._is_outlier(30.0)  # Within 6.0 cm
+        assert sensor.readings_buffer[-1] == 25.0  # Median of 24.0, 25.0, 26.0
+
+    def test_get_distance_follows_step_change(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+        """Test that readings are not rejected for differing from the previous stable reading."""
+        sensor = UltrasonicSensor(sample_count=3, outlier_threshold=3.0)
+
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
+            mock_single.side_effect = [25.0, 25.0, 25.0, 40.0, 41.0, 40.5]
+
+            sensor.get_distance()
+            sensor.get_distance()
+
+        assert mock_single.call_count == 6
+        assert sensor.readings_buffer[-1] == 40.5
 
     def test_get_distance_successful(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
         """Test successful distance measurement with filtering."""
-        mock_gpio.getmode.return_value = None
         sensor = UltrasonicSensor(sample_count=3)
 
-        with patch.object(sensor, "_get_single_distance") as mock_single:
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
             # Return multiple valid readings
             mock_single.side_effect = [25.0, 24.5, 25.5]
 
@@ -115,55 +237,203 @@ class TestUltrasonicSensor:
         self, mock_gpio: MagicMock, mock_time: MagicMock, caplog: pytest.LogCaptureFixture
     ) -> None:
         """Test distance measurement when no valid readings are available."""
+        caplog.set_level(logging.WARNING)
         sensor = UltrasonicSensor(sample_count=3)
 
-        with patch.object(sensor, "_get_single_distance") as mock_single:
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
             mock_single.return_value = -1.0  # All readings fail
 
-            with caplog.at_level(logging.WARNING):
-                distance = sensor.get_distance()
+            distance = sensor.get_distance()
 
             assert distance == -1.0
-            assert "No valid readings" in caplog.text
+            assert "No valid readings for distance measurement" in caplog.messages
 
     def test_get_distance_single_reading(
         self, mock_gpio: MagicMock, mock_time: MagicMock, caplog: pytest.LogCaptureFixture
     ) -> None:
         """Test distance measurement with only one valid reading."""
-        mock_gpio.getmode.return_value = None
+        caplog.set_level(logging.DEBUG, logger="rpi_electronics_playground.ultrasonicsensor")
         sensor = UltrasonicSensor(sample_count=3)
 
-        with patch.object(sensor, "_get_single_distance") as mock_single:
-            mock_single.side_effect = [-1.0, 25.0, -1.0, -1.0, -1.0, -1.0]
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
+            # One valid reading, then failures for however many retries the measurement makes
+            readings = iter([-1.0, 25.0])
+            mock_single.side_effect = lambda: next(readings, -1.0)
 
-            with caplog.at_level(logging.DEBUG, logger="rpi_electronics_playground.ultrasonicsensor"):
-                distance = sensor.get_distance()
+            distance = sensor.get_distance()
 
             assert distance == 25.0
-            assert "Using single reading" in caplog.text
+            assert "Using single reading: 25.0 cm" in caplog.messages
 
     def test_moving_average_buffer(self, mock_gpio: MagicMock) -> None:
         """Test that the moving average buffer works correctly."""
-        mock_gpio.getmode.return_value = None
         sensor = UltrasonicSensor(filter_size=3)
 
-        with patch.object(sensor, "_get_single_distance") as mock_single:
-            mock_single.return_value = 25.0
+        # Fill the buffer directly, the readings that would produce these values are covered elsewhere
+        sensor.readings_buffer.extend([25.0] * 5)
+
+        # Buffer should respect maxlen
+        assert len(sensor.readings_buffer) == 3
+        assert sensor.readings_buffer.maxlen == 3
+
+    def test_moving_average_value(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+        """Test that the smoothed distance is the mean of the buffered readings."""
+        sensor = UltrasonicSensor(filter_size=3)
+
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
+            distances = []
+            for reading in (20.0, 30.0, 40.0, 50.0):
+                mock_single.return_value = reading
+                distances.append(sensor.get_distance())
+
+        assert distances == [20.0, 25.0, 30.0, 40.0]
+        assert sensor.last_stable_reading == 40.0
 
-            # Take multiple measurements
-            for _ in range(5):
-                sensor.get_distance()
+    def test_last_stable_reading(self, mock_gpio: MagicMock, mock_time: MagicMock) -> None:
+        """Test that the last stable reading is the latest smoothed distance before rounding."""
+        sensor = UltrasonicSensor(sample_count=1, filter_size=2)
 
-            # Buffer should respect maxlen
-            assert len(sensor.readings_buffer) == 3
-            assert sensor.readings_buffer.maxlen == 3
+        with patch.object(UltrasonicSensor, "_get_single_distance") as mock_single:
+            mock_single.side_effect = [20.0, 20.04, -1.0]
+
+            assert sensor.get_distance() == 20.0
+            assert sensor.last_stable_reading == 20.0
+            assert sensor.get_distance() == 20.0
+            assert sensor.last_stable_reading == pytest.approx(20.02)
+
+            # A failed measurement keeps the last stable reading
+            assert sensor.get_distance() == -1.0
+            assert sensor.last_stable_reading == pytest.approx(20.02)
+
+    def test_no_instance_dict(self, sensor: UltrasonicSensor) -> None:
+        """Test that all instance attributes are stored in slots."""
+        assert not hasattr(sensor, "__dict__")
 
     def test_cleanup(self, mock_gpio: MagicMock, caplog: pytest.LogCaptureFixture) -> None:
         """Test sensor cleanup."""
-        mock_gpio.getmode.return_value = None
+        caplog.set_level(logging.INFO)
+        sensor = UltrasonicSensor()
+
+        sensor.cleanup()
+
+        assert "UltrasonicSensor cleanup complete" in caplog.messages
+
+
+class TestUltrasonicSensorPigpio:
+    """Unit tests for UltrasonicSensor echo timing with pigpio edge callbacks."""
+
+    def test_initialization_registers_callback(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that an edge callback is registered on the echo pin when pigpio is available."""
+        sensor = UltrasonicSensor()
+
+        mock_pi = mock_pigpio.pi.return_value
+        mock_pi.set_mode.assert_called_once_with(6, mock_pigpio.INPUT)
+        mock_pi.callback.assert_called_once_with(6, mock_pigpio.EITHER_EDGE, sensor._on_echo_edge)
+        assert sensor._pi is mock_pi
+
+    def test_initialization_without_daemon(
+        self, mock_gpio: MagicMock, mock_pigpio: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that the sensor falls back to polling when the pigpio daemon is not running."""
+        mock_pigpio.pi.return_value.connected = False
+
+        with caplog.at_level(logging.WARNING):
+            sensor = UltrasonicSensor()
+
+        assert sensor._pi is None
+        mock_pigpio.pi.return_value.stop.assert_called_once()
+        assert "pigpio daemon not running, falling back to polling the echo pin" in caplog.messages
+
+    def test_single_distance_measurement(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that the distance is computed from the echo pulse width reported by the callbacks."""
+        sensor = UltrasonicSensor()
+
+        def echo(*_: int) -> None:
+            sensor._on_echo_edge(6, 1, 1_000)
+            sensor._on_echo_edge(6, 0, 1_100)
+
+        mock_pigpio.pi.return_value.gpio_trigger.side_effect = echo
+
+        # Expected: 100us * 0.01715 = 1.715, rounded half up to 1.72
+        assert sensor._get_single_distance() == 1.72
+        mock_pigpio.pi.return_value.gpio_trigger.assert_called_once_with(5, 10, 1)
+        mock_gpio.input.assert_not_called()
+
+    def test_single_distance_timeout(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that a missing echo returns -1.0."""
         sensor = UltrasonicSensor()
 
-        with caplog.at_level(logging.INFO):
+        with patch.object(sensor, "_echo_event") as mock_event:
+            mock_event.wait.return_value = False
+            assert sensor._get_single_distance() == -1.0
+
+        mock_event.wait.assert_called_once_with(UltrasonicSensor.ECHO_TIMEOUT)
+
+    def test_watchdog_edge_ignored(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that watchdog timeouts do not complete a measurement."""
+        sensor = UltrasonicSensor()
+
+        sensor._on_echo_edge(6, 2, 1_000)
+
+        assert not sensor._echo_event.is_set()
+
+    def test_cleanup(self, mock_gpio: MagicMock, mock_pigpio: MagicMock) -> None:
+        """Test that cleanup cancels the callback and disconnects from the daemon."""
+        sensor = UltrasonicSensor()
+        mock_pi = mock_pigpio.pi.return_value
+
+        sensor.cleanup()
+
+        mock_pi.callback.return_value.cancel.assert_called_once()
+        mock_pi.stop.assert_called_once()
+        assert sensor._pi is None
+
+
+class TestUltrasonicSensorBackground:
+    """Unit tests for UltrasonicSensor background sampling."""
+
+    def test_get_distance_returns_latest(self, mock_gpio: MagicMock) -> None:
+        """Test that get_distance returns the sampler's latest distance without measuring."""
+        measured = threading.Event()
+
+        def measure(_: UltrasonicSensor) -> float:
+            measured.set()
+            return 25.0
+
+        with patch.object(UltrasonicSensor, "_measure_distance", autospec=True, side_effect=measure) as mock_measure:
+            sensor = UltrasonicSensor(background=True)
+            assert measured.wait(1.0)
+            calls_before = mock_measure.call_count
+
+            distance = sensor.get_distance()
+            sensor.cleanup()
+
+        assert distance == 25.0
+        assert mock_measure.call_count - calls_before <= 1  # Only the sampler thread measures
+
+    def test_cleanup_stops_sampler(self, mock_gpio: MagicMock) -> None:
+        """Test that cleanup stops and joins the sampler thread."""
+        with patch.object(UltrasonicSensor, "_measure_distance", return_value=25.0):
+            sensor = UltrasonicSensor(background=True)
+            sampler = sensor._sampler
             sensor.cleanup()
 
-        assert "cleanup complete" in caplog.text
+        assert sampler is not None
+        assert not sampler.is_alive()
+        assert sensor._sampler is None
+
+    def test_get_distance_before_first_sample(self, mock_gpio: MagicMock) -> None:
+        """Test that get_distance reports no reading until the sampler has measured."""
+        release = threading.Event()
+
+        def measure(_: UltrasonicSensor) -> float:
+            release.wait(1.0)
+            return 25.0
+
+        with patch.object(UltrasonicSensor, "_measure_distance", autospec=True, side_effect=measure):
+            sensor = UltrasonicSensor(background=True)
+            distance = sensor.get_distance()
+            release.set()
+            sensor.cleanup()
+
+        assert distance == -1.0